@@ -0,0 +1,213 @@
+""" Benchmark suite for the flooding network engines, runs the problem and the solution flood on the built-in topology
+    and on generated grids of 1k, 10k and 100k nodes over several ttl values. A grid runs one flood from the centre of
+    every 32x32 block to a node in reach of every ttl, so the work grows with the grid, and a seen flood from the
+    centre to the far corner with the smallest ttl reaching it, which covers the whole grid and delivers. The hub
+    topology is a scale-free network of 2k nodes whose hubs queue thousands of packets on a few links, it checks the
+    memory of the engines under hot spots. Every case runs in a fresh process and reports the wall time per tick, the
+    packets processed per second, the peak RSS, the peak traced memory and the memory blocks allocated by the flood
+    and still held when it ends. The results are saved as JSON and compared with a stored baseline, the script exits
+    with status 1 when a case regressed"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+import flooding_network as flooding     # noqa: E402
+
+
+
+def grid_floods(rows, cols, block=32):  # Returns a (source, destination) pair from the centre of every block x block
+    return [(r * cols + c, r * cols + c + 4)    # square of a grid to the node 4 hops to the right
+            for r in range(block // 2, rows, block) for c in range(block // 2, cols - 4, block)]
+
+
+TTLS = [4, 8, 11]                       # Ttls of the floods to destinations 4 hops away
+# name: (topology spec, (source, destination 4 hops away) pairs, source and destination of the covering flood, ttls)
+TOPOLOGIES = {'builtin': ('builtin', [(0, 14)], 0, 14, TTLS),
+              '1k': ('grid:32x32', grid_floods(32, 32), 528, 0, TTLS),
+              '10k': ('grid:100x100', grid_floods(100, 100), 5050, 0, TTLS),
+              '100k': ('grid:317x316', grid_floods(317, 316), 50086, 0, TTLS),
+              'hub': ('scale-free:2000:2:1', [(0, 1999)], 0, 1999, [6])}
+MODES = ['problem', 'solution']
+TICKS = 12                              # Iterations of the floods to destinations 4 hops away
+COVER_MODE = 'seen'                     # Mode of the flood to the far destination, run for 2 * ttl + 2 iterations
+REPEATS = 5                             # Least number of repeats, the fastest repeat is reported
+MIN_SECONDS = 0.5                       # Repeats continue until the timed iterations add up to this
+MAX_SECONDS = 10.0                      # A case taking this long stops before REPEATS, after at least one repeat
+TIME_METRICS = ['seconds_per_tick', 'packets_per_second']     # Compared with the tolerance
+MEMORY_METRICS = ['peak_traced_bytes']                        # Compared with the memory tolerance
+EXACT_METRICS = ['transmissions', 'packets_received']         # Have to match
+
+
+def case_name(topology, ttl, mode, engine):   # A ttl of None is the smallest ttl reaching the destination
+    return topology + '/ttl' + ('auto' if ttl is None else str(ttl)) + '/' + mode + '/' + engine
+
+
+class Flood:
+    """ One benchmark case, concurrent floods between (source, destination) pairs started in the same iteration. The
+        network is built once and cleared before every repeat so only the iterations are timed"""
+    def __init__(self, engine, topology, pairs, ttl, mode):
+        self.engine = engine
+        self.pairs = pairs
+        self.mode = mode
+        self.net = flooding.build_network(topology)
+        if ttl is None:                 # The smallest ttl with which every flood reaches its destination
+            ttl = max(self.net.minimal_ttl(source, destination) for source, destination in pairs)
+            self.ticks = 2 * ttl + 2
+        else:
+            self.ticks = TICKS
+        self.ttl = ttl
+        if engine == 'aggregate':
+            self.net = flooding.AggregateNetwork(self.net)
+
+    def run(self):                      # Returns the seconds taken by the iterations, the transmissions and received
+        self.net.clear_all()
+        if self.engine == 'scheduler':
+            tick = flooding.Scheduler(self.net, self.mode).run_tick
+            for source, destination in self.pairs:
+                flooding.inject(self.net, source, destination, self.ttl, self.mode)
+        else:
+            tick = self.net.run_tick
+            for source, destination in self.pairs:
+                packet = flooding.Packet()
+                packet.ttl = self.ttl
+                packet.set_destination(destination)
+                self.net.init_network(source, packet)
+        start = time.perf_counter()
+        for run in range(self.ticks):
+            tick(run)
+        seconds = time.perf_counter() - start
+        destinations = sorted({destination for source, destination in self.pairs})
+        if self.engine == 'aggregate':
+            return seconds, int(self.net.transmissions), int(self.net.packets_received[destinations].sum())
+        return seconds, self.net.transmissions, sum(self.net.nodes[d].packets_received for d in destinations)
+
+
+def run_case(engine, name, ttl, mode):      # Measures one case, runs in its own process
+    spec_, pairs, source, far, ttls = TOPOLOGIES[name]
+    topology = flooding.load_topology(spec_)
+    if ttl is None:
+        pairs = [(source, far)]
+    flood = Flood(engine, topology, pairs, ttl, mode)
+    best = None
+    total = 0.0
+    repeats = 0
+    while repeats == 0 or total < MIN_SECONDS or (repeats < REPEATS and total < MAX_SECONDS):
+        seconds, transmissions, received = flood.run()
+        best = seconds if best is None else min(best, seconds)
+        total += seconds
+        repeats += 1
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss     # Before tracing adds its own memory
+    del flood                           # The traced peak covers building the network and the engine state
+    tracemalloc.start()
+    flood = Flood(engine, topology, pairs, ttl, mode)
+    before = tracemalloc.take_snapshot()
+    flood.run()
+    peak_traced = tracemalloc.get_traced_memory()[1]
+    # The blocks the run allocated and still holds, summed over the source lines which gained blocks so the blocks
+    # freed from before the run do not cancel them out
+    grown = [stat for stat in tracemalloc.take_snapshot().compare_to(before, 'lineno') if stat.count_diff > 0]
+    tracemalloc.stop()
+    return {'seconds_per_tick': best / flood.ticks,
+            'ticks': flood.ticks,
+            'ttl': flood.ttl,
+            'repeats': repeats,
+            'packets_per_second': transmissions / best if best > 0 else 0.0,
+            'transmissions': transmissions,
+            'packets_received': received,
+            'peak_rss_kb': peak_rss,
+            'peak_traced_bytes': peak_traced,
+            'retained_blocks': sum(stat.count_diff for stat in grown),
+            'retained_bytes': sum(stat.size_diff for stat in grown)}
+
+
+def cases(sizes):                       # Every (engine, topology, ttl, mode) combination of the suite
+    engines = ['scheduler'] + (['aggregate'] if importlib.util.find_spec('numpy') is not None else [])
+    for name in sizes:
+        for ttl in TOPOLOGIES[name][4]:
+            for mode in MODES:
+                for engine in engines:
+                    if engine == 'aggregate' and mode != 'problem':
+                        continue        # The aggregate engine only runs the problem flood
+                    yield engine, name, ttl, mode
+        yield 'scheduler', name, None, COVER_MODE
+
+
+def compare(results, baseline, tolerance, memory_tolerance, sizes):     # Returns the regressions against the baseline
+    regressions = []
+    for name in sorted(baseline):       # A case of the sizes run which produced no result is a regression as well
+        if name.split('/')[0] in sizes and name not in results:
+            regressions.append(name + ': no result')
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for metric in EXACT_METRICS:
+            if result[metric] != expected[metric]:
+                regressions.append(name + ': ' + metric + ' ' + str(result[metric]) + ' != ' + str(expected[metric]))
+        if result['seconds_per_tick'] > expected['seconds_per_tick'] * (1 + tolerance):
+            regressions.append(name + ': seconds_per_tick {:.6f} > {:.6f}'.format(
+                result['seconds_per_tick'], expected['seconds_per_tick'] * (1 + tolerance)))
+        if result['packets_per_second'] < expected['packets_per_second'] / (1 + tolerance):
+            regressions.append(name + ': packets_per_second {:.0f} < {:.0f}'.format(
+                result['packets_per_second'], expected['packets_per_second'] / (1 + tolerance)))
+        for metric in MEMORY_METRICS:
+            if metric in expected and result[metric] > expected[metric] * (1 + memory_tolerance):
+                regressions.append(name + ': ' + metric + ' {} > {:.0f}'.format(
+                    result[metric], expected[metric] * (1 + memory_tolerance)))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', default=list(TOPOLOGIES), choices=list(TOPOLOGIES))
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', default=os.path.join(HERE, 'baseline.json'))
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed slowdown before a case fails')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25,
+                        help='allowed growth of the peak traced memory before a case fails')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for engine, name, ttl, mode in cases(args.sizes):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_case, engine, name, ttl, mode).result()
+        results[case_name(name, ttl, mode, engine)] = result
+        print('{:<32} {:>10.6f} s/tick {:>12.0f} packets/s {:>9} KB rss {:>9} KB traced'.format(
+            case_name(name, ttl, mode, engine), result['seconds_per_tick'], result['packets_per_second'],
+            result['peak_rss_kb'], result['peak_traced_bytes'] // 1024))
+
+    report = {'python': platform.python_version(), 'platform': platform.platform(),
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('No baseline at ' + args.baseline + ', run with --save-baseline to store one')
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance, args.sizes)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    print(str(len(regressions)) + ' regressions against ' + args.baseline)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,3247 @@
+""" Flooding network simulator, importing the module only defines it, run() simulates a flood and returns a Result
+    and main() is the command line. numpy, asyncio, argparse, csv, json and the process pools are imported by the
+    functions using them so the import stays cheap"""
+import functools
+import heapq
+import math
+import mmap
+import operator
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+
+np = None                               # numpy, loaded by load_numpy for the AggregateNetwork engine and read_trace
+
+
+def load_numpy(user):                   # Imports numpy the first time it is needed, user names what needs it
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(user + ' requires numpy') from None
+        np = numpy
+    return np
+
+
+class SourceList:
+    """ This class holds the identifiers of the nodes a packet has travelled through as a persistent chain, every entry
+     points back to the entry before it so packet copies can share their history. The nodes below MASK_NODES are kept
+     in a bitmask of fixed size for constant time membership checks, the entries of the other nodes are linked to each
+     other so a check only walks those, and adding a node costs the same whatever the size of the network"""
+    __slots__ = ('node', 'parent', 'mask', 'length', 'wide')
+    MASK_NODES = 64                     # Nodes with a bit in the mask, the mask stays a small integer
+
+    def __init__(self, node=None, parent=None):
+        self.node = node                # The node identifier held by this entry of the chain
+        self.parent = parent            # The previous entry of the chain, None for the empty list
+        if parent is None:
+            self.mask = 0               # A bit is set for every node identifier below MASK_NODES in the chain
+            self.length = 0             # Number of entries in the chain
+            self.wide = None            # The last entry of the chain holding a node of MASK_NODES or above
+        elif node < self.MASK_NODES:
+            self.mask = parent.mask | (1 << node)
+            self.length = parent.length + 1
+            self.wide = parent.wide
+        else:
+            self.mask = parent.mask
+            self.length = parent.length + 1
+            self.wide = self
+
+    def add(self, a):                   # Returns a new list with the identifier added, this list is left untouched
+        return SourceList(a, self)
+
+    def __contains__(self, a):
+        try:
+            a = operator.index(a)       # Accepts numpy integers, floats and strings are never node identifiers
+        except TypeError:
+            return False
+        if a < 0:
+            return False
+        if a < self.MASK_NODES:
+            return (self.mask >> a) & 1 == 1
+        entry = self.wide
+        while entry is not None:        # Only the entries of the nodes without a bit are visited
+            if entry.node == a:
+                return True
+            entry = entry.parent.wide
+        return False
+
+    def __iter__(self):
+        entries = []
+        entry = self
+        while entry.parent is not None:
+            entries.append(entry.node)
+            entry = entry.parent
+        return reversed(entries)
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Packet:
+    """ This class represents the Packet to be transmitted in the network, while have the attributes of ttl, source, source_list,
+     next_destination, final destination and execution time"""
+    __slots__ = ('ttl', 'source', 'source_list', 'final_destination', 'next_destination', 'exec_time', 'flood_id',
+                 'arrival')
+
+    def __init__(self):     # Packet constructor which is initialized every time the object is created
+        self.ttl = 11       # TTL value is always +1 due to the initialization of the network is done by receiving a packet at the source node
+        self.source = 0     # Used to mark where the packet came from so the nodes dont transfer the packet back through the same path
+        self.source_list = SourceList()     # Used for the solution so the nodes dont receive the packet twice and avoid repeating duplication
+        self.final_destination = 14     # Notes the final node destination in the network
+        self.next_destination = 0       # User to identify the next destination the packet will travel
+        self.exec_time = 0              # Used to implement discrete time, while only using the link once every iteration
+        self.flood_id = None            # (source, sequence number) of the flood, used by the nodes in the seen mode
+        self.arrival = 0                # Arrival number of the packet in the queue holding it, set by PacketQueue.append
+
+    def increment_exec_time(self):      # Used to change the execution time of the transfer in case the link is busy
+        self.exec_time += 1
+
+    def dec_ttl(self):                  # Decrements the ttl
+        self.ttl -= 1
+
+    def get_ttl(self):                  # Returns the ttl value of any packet object
+        return self.ttl
+
+    def get_source(self):               # Returns the node which the packet last travelled through
+        return self.source
+
+    def get_sources(self):              # Returns the identifier list of all the nodes the packet has travelled through
+        return self.source_list
+
+    def set_source(self, e):            # Used to change the source when travelling through a node
+        self.source = e
+
+    def reg_source(self, a):            # Used to add an identifier when travelling through a node in the solution
+        self.source_list = self.source_list.add(a)
+
+    def get_destination(self):          # Used to return the final destination
+        return self.final_destination
+
+    def set_destination(self, f):       # Used to set the final destination
+        self.final_destination = f
+
+    def set_next(self, a):              # Used to set the next hop in the network
+        self.next_destination = a
+
+    def get_next(self):                 # Used to find the next hop in the network
+        return self.next_destination
+
+    def set_exec_time(self, a):         # Used to change the execution time of the packet transmission
+        self.exec_time = a
+
+    def get_exec_time(self):            # Used to find the execution time of the packet transfer
+        return self.exec_time
+
+    def copy(self):                     # Used to duplicate the packet, the copy shares the source list with the original
+        c = Packet.__new__(Packet)
+        c.ttl = self.ttl
+        c.source = self.source
+        c.source_list = self.source_list
+        c.final_destination = self.final_destination
+        c.next_destination = self.next_destination
+        c.exec_time = self.exec_time
+        c.flood_id = self.flood_id
+        return c
+
+
+class PacketQueue:
+    """ This class holds the packets waiting at a node, bucketed on their execution time and inside a bucket split in
+        one lane per next hop. A link carries one packet per iteration, so only the head of every lane can be sent and
+        an iteration touches one packet per lane no matter how long the queue is, or as many as the link capacity
+        allows. The bucket key is the execution time of its packets, their exec_time attribute is brought up to date
+        whenever they are taken out of the queue. Every appended packet is numbered, so indexing the queue follows the
+        order the packets arrived in like the list the queue replaced"""
+    __slots__ = ('buckets', 'size', 'arrivals')
+
+    def __init__(self):
+        self.buckets = {}               # Maps an execution time to a dict of next hop -> deque of packets
+        self.size = 0                   # Number of packets in all buckets
+        self.arrivals = 0               # Number given to the next appended packet
+
+    def append(self, b):                # Used to add a packet behind the packets with the same execution time and next hop
+        lanes = self.buckets.get(b.exec_time)
+        if lanes is None:
+            lanes = self.buckets[b.exec_time] = {}
+        lane = lanes.get(b.next_destination)
+        if lane is None:
+            lane = lanes[b.next_destination] = deque()
+        lane.append(b)
+        b.arrival = self.arrivals
+        self.arrivals += 1
+        self.size += 1
+
+    def pop_due(self, t):               # Used to take out the lanes of the packets due at time t, they still count in the size
+        return self.buckets.pop(t, None)
+
+    def requeue(self, due, t):          # Used to put the lanes taken out by pop_due back in front of the lanes due at time t
+        lanes = self.buckets.get(t)
+        if lanes is None:
+            lanes = self.buckets[t] = {}
+        for c, lane in due.items():
+            if not lane:
+                continue
+            queued = lanes.get(c)
+            if queued is None:
+                lanes[c] = lane
+            elif len(queued) < len(lane):               # Moves the shorter lane into the longer one
+                lane.extend(queued)
+                lanes[c] = lane
+            else:
+                queued.extendleft(reversed(lane))
+        if not lanes:
+            del self.buckets[t]
+
+    def pop_oldest(self):               # Takes out the first packet of the earliest bucket, None if there is none
+        if not self.buckets:
+            return None
+        t = min(self.buckets)
+        lanes = self.buckets[t]
+        c = next(iter(lanes))
+        b = lanes[c].popleft()
+        if not lanes[c]:
+            del lanes[c]
+            if not lanes:
+                del self.buckets[t]
+        b.exec_time = t
+        self.size -= 1
+        return b
+
+    def pop_lane(self, c):              # Used to take out every packet queued for next hop c, they leave the size
+        packets = []
+        for t in sorted(self.buckets):
+            lanes = self.buckets[t]
+            lane = lanes.pop(c, None)
+            if lane:
+                for b in lane:
+                    b.exec_time = t
+                packets.extend(lane)
+                if not lanes:
+                    del self.buckets[t]
+        self.size -= len(packets)
+        return packets
+
+    def shift(self, d):                 # Used to delay every packet in the queue by d iterations
+        self.buckets = {t + d: lanes for t, lanes in self.buckets.items()}
+
+    def clear(self):
+        self.buckets.clear()
+        self.size = 0
+
+    def locate(self, a):                # Used to find the lane and the position in it of the a-th packet to arrive
+        if a < 0:
+            a += self.size
+        if not 0 <= a < self.size:
+            raise IndexError('queue index out of range')
+        queued = [(b.arrival, t, lane, i) for t, lanes in self.buckets.items() for lane in lanes.values()
+                  for i, b in enumerate(lane)]
+        arrival, t, lane, i = heapq.nsmallest(a + 1, queued)[a]
+        lane[i].exec_time = t
+        return t, lane, i
+
+    def __getitem__(self, a):
+        t, lane, i = self.locate(a)
+        return lane[i]
+
+    def __delitem__(self, a):
+        t, lane, i = self.locate(a)
+        del lane[i]
+        self.size -= 1
+        if not lane:
+            lanes = self.buckets[t]
+            for c in [c for c in lanes if not lanes[c]]:
+                del lanes[c]
+            if not lanes:
+                del self.buckets[t]
+
+    def __iter__(self):
+        for t in sorted(self.buckets):
+            for lane in self.buckets[t].values():
+                for b in lane:
+                    b.exec_time = t
+                    yield b
+
+    def __len__(self):
+        return self.size
+
+
+class Link:
+    """ This class represents the Link between nodes and holds values of the status, Id and the connection, a link
+        carries capacity packets per iteration and its status is True once it is full"""
+    def __init__(self):
+        self.status = False             # Used to identify whether the link is being used or not
+        self.link_id = 0                # Used to identify the link being used
+        self.linked_between = [] * 2    # Used to identify the nodes on both ends of the link
+        self.packets_received = 0       # Used to identify how many packets have been received in the solution
+        self.capacity = 1               # Packets the link carries per iteration
+        self.load = 0                   # Packets sent over the link in the current iteration
+
+    def set_status(self, d):            # Used to change the link status, True sends one more packet over the link
+        if d:
+            self.load += 1
+            self.status = self.load >= self.capacity
+        else:
+            self.load = 0
+            self.status = False
+
+    def get_status(self):               # Returns the link status
+        return self.status
+
+    def set_link_id(self, e):           # Used to change or set the link id
+        self.link_id = e
+
+    def get_link_id(self):              # Returns the link id
+        return self.link_id
+
+    def set_connection(self, a):        # sets the connection on both ends of the node
+        self.linked_between = a
+
+    def get_target(self):               # Used to identify the receiving end of the link
+        return self.linked_between[1]
+
+    def get_source(self):               # Used to identify the sending end of the link
+        return self.linked_between[0]
+
+    def get_connection(self):           # Returns both ends of the link
+        return self.linked_between
+
+
+class Node:
+    """ The class represent a node which is used to transmit and receive packets, with the attributes of Id, Packet queue
+        links, a queue of duplicates, transmission completed (Done) and in case of the final_node destination (Packets received)"""
+    def __init__(self):
+        self.node_id = 0                # Used to identify a specific node
+        self.nodeQueue = PacketQueue()  # Holds the packets waiting to be sent
+        self.node_links = [] * 10       # Holds the links linked to other nodes
+        self.duplicates = [] * 100      # Used for the duplication process
+        self.done = False               # Used to check if all transmission are completed
+        self.packets_received = 0       # Used to check how many packets the destination has received
+        self.seen = None                # SeenCache of the floods forwarded in the seen mode, made on first use
+
+    def set_node_id(self, a):           # Used to change a node id
+        self.node_id = a
+
+    def get_node_id(self):              # Returns the Id of the node
+        return self.node_id
+
+    def set_node_links(self, a):        # Used to add links to the node
+        self.node_links.append(a)
+
+    def get_node_links(self):           # Used to find the links of the node
+        return self.node_links
+
+    def get_node_link(self, a):         # Used to find a single link of the node
+        return self.node_links[a]
+
+    def print_queue(self):              # Used to print the queues at the node
+        print('Queue at Node: ' + str(self.node_id) + ' = ' + str(len(self.nodeQueue)) + '\n')
+
+    def add_queue(self, a):             # Used to add a packet to the node queue
+        self.nodeQueue.append(a)
+
+    def get_queue(self, a):             # Used to get a index specific packet from the queue
+        return self.nodeQueue[a]
+
+    def remove_queue(self, a):          # Used to remove a packet from the queue after transmission
+        del self.nodeQueue[a]
+
+    def get_all_queue(self):            # Used to return all of the queue, usually as size
+        return self.nodeQueue
+
+    def queue_size(self):               # Returns the number of packets in the queue
+        return self.nodeQueue.size
+
+    def copy_packet(self, b, c):        # Used to duplicate a packet
+        d = b.copy()
+        d.next_destination = c
+        self.nodeQueue.append(d)
+
+    def increment_exec_time(self):      # Used to increment the execution time of a packet
+        self.nodeQueue.shift(1)
+
+
+class SeenCache:
+    """ Bounded set of the flood ids a node has already forwarded, when it is full the least recently seen id is
+        evicted and if max_age is set the ids not seen for more than max_age iterations are evicted as well"""
+    def __init__(self, capacity=1024, max_age=None):
+        self.capacity = capacity        # Largest number of ids kept
+        self.max_age = max_age          # Iterations an id is kept after it was last seen, None keeps it until evicted
+        self.entries = OrderedDict()    # Flood id: iteration it was last seen, the least recently seen first
+
+    def check(self, key, t):            # Returns True if key was seen before, either way key is recorded as seen at t
+        entries = self.entries
+        if self.max_age is not None:
+            while entries and next(iter(entries.values())) < t - self.max_age:
+                entries.popitem(last=False)
+        if key in entries:
+            entries[key] = t
+            entries.move_to_end(key)
+            return True
+        entries[key] = t
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Topology:
+    """ This class holds the links of a network in a compressed sparse row layout, two arrays hold the ends of every
+        link and every node owns a slice of the adjacency arrays with its neighbors and the links leading to them in
+        link id order. Indexing a Topology returns the (node, node) pair of a link, like the TOPOLOGY list"""
+    def __init__(self, node_count, link_source, link_target):
+        self.node_count = node_count            # Number of nodes, the node ids are 0 - node_count - 1
+        self.link_source = link_source          # Array of the first node of every link
+        self.link_target = link_target          # Array of the second node of every link
+        degree = array('q', bytes(8 * (node_count + 1)))
+        for a, b in zip(link_source, link_target):
+            degree[a + 1] += 1
+            if a != b:
+                degree[b + 1] += 1
+        for a in range(node_count):             # Turns the degrees into the start of every node slice
+            degree[a + 1] += degree[a]
+        self.offsets = degree                   # The neighbors of node a are at offsets[a] - offsets[a + 1] - 1
+        self.adjacent = array('i', bytes(4 * degree[node_count]))       # Neighbor at the other end of the link
+        self.adjacent_link = array('i', bytes(4 * degree[node_count]))  # Link id leading to the neighbor
+        position = array('q', degree)
+        for c in range(len(link_source)):
+            a = link_source[c]
+            b = link_target[c]
+            self.adjacent[position[a]] = b
+            self.adjacent_link[position[a]] = c
+            position[a] += 1
+            if a != b:
+                self.adjacent[position[b]] = a
+                self.adjacent_link[position[b]] = c
+                position[b] += 1
+
+    @classmethod
+    def from_edges(cls, edges, node_count=None):    # Builds a topology from a list of (node, node) pairs
+        link_source = array('i', (a for a, b in edges))
+        link_target = array('i', (b for a, b in edges))
+        if node_count is None:
+            node_count = max(max(link_source, default=-1), max(link_target, default=-1)) + 1
+        return cls(node_count, link_source, link_target)
+
+    @classmethod
+    def load(cls, path, fmt='edgelist', node_count=None):  # Streams a topology from an edge list or adjacency list file
+        """ Every line of an edge list holds the two node ids of a link, any further column such as a weight is
+            ignored. Every line of an adjacency list holds a node id followed by the ids of its neighbors. Lines
+            starting with # or % are comments. The file is memory mapped and parsed line by line, so only the link
+            arrays are held in memory"""
+        if fmt not in ('edgelist', 'adjlist'):
+            raise ValueError('Unknown topology file format: ' + str(fmt))
+        link_source = array('i')
+        link_target = array('i')
+        with open(path, 'rb') as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:                  # Empty files cannot be mapped
+                data = None
+            if data is not None:
+                with data:
+                    for line in iter(data.readline, b''):
+                        fields = line.split()
+                        if not fields or fields[0][:1] in (b'#', b'%'):
+                            continue
+                        a = int(fields[0])
+                        if fmt == 'edgelist':
+                            link_source.append(a)
+                            link_target.append(int(fields[1]))
+                        else:
+                            for b in fields[1:]:
+                                link_source.append(a)
+                                link_target.append(int(b))
+        if node_count is None:
+            node_count = max(max(link_source, default=-1), max(link_target, default=-1)) + 1
+        return cls(node_count, link_source, link_target)
+
+    def get_node_count(self):                   # Returns the number of nodes
+        return self.node_count
+
+    def get_link_count(self):                   # Returns the number of links
+        return len(self.link_source)
+
+    def degree(self, a):                        # Returns the number of links of node a
+        return self.offsets[a + 1] - self.offsets[a]
+
+    def neighbors(self, a):                     # Returns the (neighbor, link_id) pairs of node a
+        start, end = self.offsets[a], self.offsets[a + 1]
+        return list(zip(self.adjacent[start:end], self.adjacent_link[start:end]))
+
+    def find_link(self, a, b):                  # Returns the lowest link id between node a and b, None if there is none
+        start, end = self.offsets[a], self.offsets[a + 1]
+        try:
+            return self.adjacent_link[self.adjacent.index(b, start, end)]
+        except ValueError:
+            return None
+
+    def save(self, path):                       # Writes the topology as an edge list file
+        with open(path, 'w') as f:
+            for a, b in zip(self.link_source, self.link_target):
+                f.write(str(a) + ' ' + str(b) + '\n')
+
+    def __len__(self):
+        return len(self.link_source)
+
+    def __getitem__(self, c):
+        return self.link_source[c], self.link_target[c]
+
+
+class Adjacency:
+    """ Read only view of a Topology as the per node lists of (neighbor, link_id) pairs held by Network.neighbors"""
+    __slots__ = ('topology',)
+
+    def __init__(self, topology):
+        self.topology = topology
+
+    def __getitem__(self, a):
+        return self.topology.neighbors(a)
+
+    def __len__(self):
+        return self.topology.node_count
+
+
+class NodeTable:
+    """ The nodes of a network, a Node object is only created the first time its node is used so a large topology only
+        pays for the nodes a flood reaches. It is used like the list of nodes it replaces"""
+    __slots__ = ('net', 'count', 'created')
+
+    def __init__(self, net, count):
+        self.net = net                  # The network owning the nodes, its neighbors give the links of a new node
+        self.count = count              # Number of nodes
+        self.created = {}               # The Node objects created so far keyed on node id
+
+    def get_created(self):              # Returns the (node id, Node) pairs of the nodes created so far
+        return self.created.items()
+
+    def __getitem__(self, a):
+        node = self.created.get(a)
+        if node is None:
+            if a < 0:
+                return self[a + self.count]
+            if a >= self.count:
+                raise IndexError('node index out of range')
+            node = Node()
+            node.set_node_id(a)
+            node.node_links = [link for neighbor, link in self.net.neighbors[a]]
+            self.created[a] = node
+        return node
+
+    def __setitem__(self, a, node):
+        if a < 0:
+            a += self.count
+        if not 0 <= a < self.count:
+            raise IndexError('node index out of range')
+        self.created[a] = node
+
+    def __iter__(self):
+        for a in range(self.count):
+            yield self[a]
+
+    def __len__(self):
+        return self.count
+
+
+class TableLink(Link):
+    """ A Link whose status and connection are kept in the arrays of a LinkTable"""
+    __slots__ = ('table', 'c')
+
+    def __init__(self, table, c):       # The state of the link lives in the table, not in the Link attributes
+        self.table = table
+        self.c = c
+
+    @property
+    def status(self):
+        return self.table.status[self.c] == 1
+
+    @status.setter
+    def status(self, d):
+        self.table.status[self.c] = 1 if d else 0
+
+    def set_status(self, d):
+        if self.table.capacity is None:         # Every link carries a single packet per iteration
+            self.table.status[self.c] = 1 if d else 0
+        elif d:
+            self.table.load[self.c] += 1
+            self.table.status[self.c] = self.table.load[self.c] >= self.table.capacity[self.c]
+        else:
+            self.table.load[self.c] = 0
+            self.table.status[self.c] = 0
+
+    @property
+    def capacity(self):
+        return 1 if self.table.capacity is None else self.table.capacity[self.c]
+
+    @capacity.setter
+    def capacity(self, d):
+        self.table.set_capacity(d, [self.c])
+
+    @property
+    def load(self):
+        return self.table.status[self.c] if self.table.load is None else self.table.load[self.c]
+
+    @property
+    def link_id(self):
+        return self.c
+
+    @link_id.setter
+    def link_id(self, e):
+        if e != self.c:
+            raise ValueError('The id of a link loaded from a topology is its index')
+
+    @property
+    def linked_between(self):
+        if self.table.topology.link_source[self.c] < 0:
+            return []
+        return [self.table.topology.link_source[self.c], self.table.topology.link_target[self.c]]
+
+    @linked_between.setter
+    def linked_between(self, a):
+        if a:
+            self.table.topology.link_source[self.c], self.table.topology.link_target[self.c] = a
+        else:
+            self.table.topology.link_source[self.c] = self.table.topology.link_target[self.c] = -1
+
+    @property
+    def packets_received(self):
+        return self.table.packets_received[self.c]
+
+    @packets_received.setter
+    def packets_received(self, d):
+        self.table.packets_received[self.c] = d
+
+
+class LinkTable:
+    """ The links of a network loaded from a Topology, the status of every link is a byte of an array and a Link is
+        only made when a link is looked up. It is used like the list of links it replaces"""
+    __slots__ = ('topology', 'status', 'packets_received', 'capacity', 'load')
+
+    def __init__(self, topology):
+        self.topology = topology                                    # The topology holding the ends of the links
+        self.status = bytearray(len(topology))                      # 1 for every busy link
+        self.packets_received = array('q', bytes(8 * len(topology)))
+        self.capacity = None                                        # Packets per iteration of every link, None for 1
+        self.load = None                                            # Packets sent in this iteration, with capacity
+
+    def set_capacity(self, capacity, links=None):   # Sets the packets per iteration of the links, all if links is None
+        if self.capacity is None:
+            self.capacity = array('i', [1]) * len(self.status)
+            self.load = array('i', bytes(4 * len(self.status)))
+        for c in range(len(self.status)) if links is None else links:
+            self.capacity[c] = capacity
+
+    def clear(self):                    # Frees every link and zeroes its load
+        self.status[:] = bytes(len(self.status))
+        if self.load is not None:
+            self.load[:] = array('i', bytes(4 * len(self.status)))
+
+    def __getitem__(self, c):
+        if c < 0:
+            c += len(self.status)
+        if not 0 <= c < len(self.status):
+            raise IndexError('link index out of range')
+        return TableLink(self, c)
+
+    def __iter__(self):
+        for c in range(len(self.status)):
+            yield TableLink(self, c)
+
+    def __len__(self):
+        return len(self.status)
+
+
+class Network:
+    """Used as a overall network to implement all objects functions with ease, the class attributes are, nodes, links,
+        , destination_finder, internal_timer and total_packets"""
+    ALL_PAIRS_LIMIT = 256               # Networks up to this many nodes compute the hop distances of all pairs at once
+
+    def __init__(self, node_count=15, link_count=28):
+        self.nodes = NodeTable(self, node_count)    # Holds all the nodes of the network used for iterative purposes
+        self.links = [Link()] * link_count      # A list which holds all the links of the network used for iterative purposes
+        self.destination = 0            # A integer used to find the destination of the other link end
+        self.internal_timer = 0         # Timer used to identify when a packet transmission is due
+        self.total_packets = 0          # Used for a counter to identify how many packets are in the network
+        self.transmissions = 0          # Counts the packets sent over a link
+        self.scheduler = None           # Scheduler notified whenever a packet becomes due at a node
+        self.busy_links = []            # Links made busy in the current iteration
+        self.used_links = []            # Links used in the last completed iteration
+        self.neighbors = [[] for _ in range(node_count)]    # Adjacency index, per node a list of (neighbor, link_id) pairs
+        self.link_index = {}            # Maps a (node, neighbor) pair to the link id connecting them
+        self.topology = None            # The Topology the links are read from, None once the links are lists
+        self.instruments = None         # Instruments counting the events of the run, None when not instrumented
+        self.distances = {}             # Hop distances to a destination node, cleared when the links change
+        self.seen_capacity = 1024       # Flood ids a node remembers in the seen mode
+        self.seen_age = None            # Iterations a node remembers a flood id, None until it is evicted
+        self.sequences = {}             # Next sequence number of the floods started at every node
+        self.wide_links = False         # True once a link carries more than one packet per iteration
+        self.queue_limit = None         # Packets a node queue holds, None for no limit
+        self.drop_policy = 'tail'       # Packet dropped from a full queue, one of DROP_POLICIES
+        self.drops = 0                  # Packets dropped from full queues
+        self.workload = None            # Workload told about the packets of its flows delivered or dropped
+
+    def increment_time(self):                   # Used to increment the internal network timer
+        self.internal_timer = self.internal_timer + 1
+
+    def get_time(self):                         # Used to return the internal_timer
+        return self.internal_timer
+
+    def set_topology(self, topology):           # Used to run the network on the links of a Topology
+        self.topology = topology
+        self.nodes = NodeTable(self, topology.get_node_count())
+        self.links = LinkTable(topology)
+        self.neighbors = Adjacency(topology)
+        self.link_index = {}
+        self.distances = {}
+
+    def thaw(self):                             # Turns the links of a Topology into editable lists before they change
+        if self.topology is None:
+            return
+        topology = self.topology
+        self.neighbors = [topology.neighbors(a) for a in range(topology.get_node_count())]
+        self.link_index = {}
+        for a in range(len(self.neighbors)):
+            for neighbor, link in self.neighbors[a]:
+                self.link_index.setdefault((a, neighbor), link)     # Links are in id order, the first is the lowest
+        links = []
+        for c in range(len(topology)):
+            link = Link()
+            link.set_link_id(c)
+            link.set_connection(self.links[c].get_connection())
+            link.status = self.links[c].get_status()
+            link.capacity = self.links[c].capacity
+            link.load = self.links[c].load
+            link.packets_received = self.links[c].packets_received
+            links.append(link)
+        self.links = links
+        self.topology = None
+
+    def make_nodes(self):                       # Generates all the nodes in the network topology
+        self.thaw()
+        for mns in range(len(self.nodes)):
+            self.nodes[mns] = Node()            # Creates an Node object
+            self.nodes[mns].set_node_id(mns)    # Sets the Node object Id
+        self.neighbors = [[] for _ in range(len(self.nodes))]   # Fresh nodes have no neighbors yet
+        self.link_index = {}
+        self.distances = {}
+
+    def make_links(self):                       # Generates all the links used in the network topology
+        self.thaw()
+        for x in range(len(self.links)):
+            self.links[x] = Link()              # Creates a Link object
+            self.links[x].set_link_id(x)        # Sets the Link object Id
+        for n in range(len(self.nodes)):        # Fresh links are not connected to anything yet
+            self.nodes[n].node_links = []
+        self.neighbors = [[] for _ in range(len(self.nodes))]
+        self.link_index = {}
+        self.distances = {}
+
+    def make_connection(self, a, b, c):         # Used to define the link connection of the network topology
+        self.thaw()
+        if self.links[a].get_connection():      # Re-wiring an existing link drops its old connection first
+            self.remove_connection(a)
+        self.links[a].linked_between = [b, c]   # Sets the connection of both ends of the link
+        self.nodes[b].set_node_links(a)         # Adds the link to one side of the node
+        self.nodes[c].set_node_links(a)         # Adds the link to the other side of the node
+        self.neighbors[b].append((c, a))        # Indexes the link from both ends
+        if c != b:
+            self.neighbors[c].append((b, a))
+        self.index_pair(b, c)
+        self.index_pair(c, b)
+        self.distances = {}                     # The hop distances have to be computed again
+
+    def remove_connection(self, a):             # Used to take a link out of the network topology
+        self.thaw()
+        b, c = self.links[a].get_connection()
+        self.links[a].linked_between = []
+        self.nodes[b].node_links.remove(a)
+        if c != b:
+            self.nodes[c].node_links.remove(a)
+        self.neighbors[b].remove((c, a))
+        if c != b:
+            self.neighbors[c].remove((b, a))
+        self.index_pair(b, c)
+        self.index_pair(c, b)
+        self.distances = {}
+
+    def fail_links(self, links):                # Takes links out of the network, the packets queued for a neighbor no
+        for c in links:                         # longer linked to their node are dropped
+            ends = self.links[c].get_connection()
+            if not ends:
+                continue
+            self.remove_connection(c)
+            for a, b in (ends, ends[::-1]):
+                if self.find_link(a, b) is None:
+                    for packet in self.nodes[a].get_all_queue().pop_lane(b):
+                        self.drop_packet(a, packet)
+
+    def index_pair(self, a, b):                 # Keeps the (node, neighbor) -> link id map on the lowest parallel link
+        ids = [link for neighbor, link in self.neighbors[a] if neighbor == b]
+        if ids:
+            self.link_index[(a, b)] = min(ids)
+        else:
+            self.link_index.pop((a, b), None)
+
+    def set_link_capacity(self, capacity, links=None):  # Sets the packets per iteration of the links, None is all links
+        if capacity < 1:
+            raise ValueError('A link has to carry at least one packet per iteration')
+        if isinstance(self.links, LinkTable):
+            self.links.set_capacity(capacity, links)
+        else:
+            for c in range(len(self.links)) if links is None else links:
+                self.links[c].capacity = capacity
+        if capacity > 1:
+            self.wide_links = True
+
+    def set_queue_limit(self, limit, policy='tail'):    # Bounds the queue of every node, None removes the bound
+        if policy not in DROP_POLICIES:
+            raise ValueError('Unknown drop policy: ' + str(policy))
+        self.queue_limit = limit
+        self.drop_policy = policy
+
+    def schedule(self, a, t):                   # Used to tell the scheduler that node a has a packet due at time t
+        if self.scheduler is not None:
+            self.scheduler.schedule(a, t)
+
+    def clear_links(self):                      # Frees every link and zeroes its load, not only the ones used last
+        if isinstance(self.links, LinkTable):
+            self.links.clear()
+        else:
+            for link in self.links:
+                link.set_status(False)
+        self.busy_links = []
+        self.used_links = []
+
+    def reset_links(self):                      # Reinitialize the links used in the iteration to false
+        for c in self.busy_links:
+            self.links[c].set_status(False)
+        self.used_links, self.busy_links = self.busy_links, []  # Kept until the next iteration for the output sinks
+
+    def find_destination(self, a, x):           # Used to identify the sending and receiving side of the link
+        self.destination = self.neighbors[a][x][0]
+
+        return self.destination
+
+    def find_link(self, a, b):                  # Used to find the link that holds a specific connection between nodes
+        if self.topology is not None:
+            return self.topology.find_link(a, b)
+        return self.link_index.get((a, b))
+
+    def adjacent_nodes(self, a):                # Returns the neighbor of every link of node a
+        if self.topology is not None:
+            return self.topology.adjacent[self.topology.offsets[a]:self.topology.offsets[a + 1]]
+        return [neighbor for neighbor, link in self.neighbors[a]]
+
+    def bfs(self, d):                           # Returns the hop distance of every node to node d, -1 if unreachable
+        distance = array('i', [-1]) * len(self.nodes)
+        distance[d] = 0
+        frontier = [d]
+        hops = 0
+        while frontier:
+            hops += 1
+            reached = []
+            for a in frontier:
+                for neighbor in self.adjacent_nodes(a):
+                    if distance[neighbor] < 0:
+                        distance[neighbor] = hops
+                        reached.append(neighbor)
+            frontier = reached
+        return distance
+
+    def distances_to(self, d):                  # Returns the cached hop distances to node d
+        distance = self.distances.get(d)
+        if distance is None:
+            if len(self.nodes) <= self.ALL_PAIRS_LIMIT:     # Small networks get the table of all pairs at once
+                for x in range(len(self.nodes)):
+                    self.distances[x] = self.bfs(x)
+            else:                                           # Large ones only the destinations asked for
+                self.distances[d] = self.bfs(d)
+            distance = self.distances[d]
+        return distance
+
+    def hop_distance(self, a, d):               # Returns the number of hops from node a to node d, -1 if unreachable
+        return self.distances_to(d)[a]
+
+    def minimal_ttl(self, source, destination):     # Returns the smallest ttl a flood needs to reach the destination
+        if source == destination:
+            raise ValueError('The source and the destination are the same node: ' + str(source))
+        hops = self.hop_distance(source, destination)
+        if hops < 0:
+            raise ValueError('Node ' + str(destination) + ' cannot be reached from node ' + str(source))
+        return hops                             # The packet arrives with a ttl of 0, which still counts as received
+
+    def emtpy_queue_problem(self, a):           # Used to empty the queue in the problem part of the flooding network
+        self.empty_queue(a, self.send_problem)
+
+    def emtpy_queue_solution(self, a):          # Used to empty the queue with the implemented solution of the network
+        self.empty_queue(a, self.send_solution)     # Works similar to the above function though the sending function is different
+
+    def emtpy_queue_pruned(self, a):            # Used to empty the queue with the distance pruned forwarding
+        self.empty_queue(a, self.send_pruned)
+
+    def emtpy_queue_seen(self, a):              # Used to empty the queue with the duplicate suppressing forwarding
+        self.empty_queue(a, self.send_seen)
+
+    def empty_queue(self, a, send):             # Sends the packets of node a due in this iteration
+        self.nodes[a].done = False              # Used to check if transmission is complete
+        queue = self.nodes[a].get_all_queue()
+        due = queue.pop_due(self.internal_timer)    # Only the packets due now are touched
+        if due:
+            for hop, lane in due.items():       # Only the first packet of a lane can get the link in this iteration
+                b = lane[0]
+                b.exec_time = self.internal_timer
+                if send(a, b):                  # Removes the packet from the queue if confirmed
+                    lane.popleft()
+                    queue.size -= 1
+                    while self.wide_links and lane:     # A link with room left takes the next packets of the lane
+                        b = lane[0]
+                        b.exec_time = self.internal_timer
+                        if not send(a, b):
+                            break
+                        lane.popleft()
+                        queue.size -= 1
+                if self.instruments is not None and lane:   # Every packet left in the lane waits for the link
+                    self.instruments.record('retry', self.internal_timer, a, self.find_link(a, hop), len(lane))
+            queue.requeue(due, self.internal_timer + 1)     # The rest of the lanes is sent next iteration
+            if self.internal_timer + 1 in queue.buckets:
+                self.schedule(a, self.internal_timer + 1)
+        self.nodes[a].done = True
+
+    def send_problem(self, a, b):           # Used to send the packets with the problem part of the flooding network
+        return self.send(a, b, self.receive_problem, self.keep_source)
+
+    def send_solution(self, a, b):          # Works similar to above function with a minor difference
+        return self.send(a, b, self.receive_solution, self.keep_sources)    # The receiving function differs as well
+
+    def send_pruned(self, a, b):            # Works as the solution, only the receiving function differs
+        return self.send(a, b, self.receive_pruned, self.keep_sources)
+
+    def send_seen(self, a, b):              # Works as the problem, only the receiving function differs
+        return self.send(a, b, self.receive_seen, self.keep_source)
+
+    def keep_source(self, a, b):            # Used to check if the next hop is the source based on the links of the node
+        if not b.get_next == b.get_source():
+            b.set_source(a)                 # Sets the source of the sending node
+            return True
+        return False
+
+    def keep_sources(self, a, b):           # Checks through a list of nodes instead of a single node
+        if b.get_next not in b.get_sources():
+            b.reg_source(a)
+            return True
+        return False
+
+    def send(self, a, b, receive, loop_check):  # Sends packet b of node a over the link to its next hop
+        if loop_check(a, b):
+            c = self.find_link(self.nodes[a].get_node_id(), b.get_next())   # Finds the link for transmission
+            if not self.links[c].get_status():                              # Checks if link is busy
+                self.links[c].set_status(True)                              # Makes the link busy
+                self.busy_links.append(c)
+                self.transmissions += 1
+                if self.instruments is not None:
+                    self.instruments.record('send', self.internal_timer, a, c)
+                receive(b.get_next(), b)                                    # Receives at the other end of the link
+                return True                                                 # Confirms that transmission was succesful
+            else:                                                           # When the link is busy
+                b.set_exec_time(self.internal_timer + 1)                    # Send packet next iteration
+                self.schedule(a, self.internal_timer + 1)
+                return False                                                # Confirmation is false
+
+    def receive_problem(self, a, b):                        # Used to receive packets at the other end of a link
+        self.deliver_or_forward(a, b, self.next_hops_problem)
+
+    def receive_solution(self, a, b):       # Similar to the above function with a minor change in conditions
+        self.nodes[a].packets_received += 1
+        self.deliver_or_forward(a, b, self.next_hops_solution)
+
+    def receive_pruned(self, a, b):         # Works as the solution but only forwards copies which can arrive in time
+        self.nodes[a].packets_received += 1
+        self.deliver_or_forward(a, b, self.next_hops_pruned)
+
+    def receive_seen(self, a, b):           # Works as the problem but a node only forwards the first copy of a flood
+        self.deliver_or_forward(a, b, self.next_hops_seen)
+
+    def next_hops_problem(self, a, b):      # Every link of the node but the one back to the packet last node place
+        return [neighbor for neighbor, link in self.neighbors[a] if not neighbor == b.get_source()]
+
+    def next_hops_solution(self, a, b):     # Every link to a node the packet has not travelled through
+        sources = b.get_sources()
+        return [neighbor for neighbor, link in self.neighbors[a] if neighbor not in sources]
+
+    def next_hops_pruned(self, a, b):       # The links of the solution which can still arrive in time
+        sources = b.get_sources()
+        distance = self.distances_to(b.get_destination())
+        hops = b.get_ttl() - 1                                      # Hops left once the copy reached the neighbor
+        return [neighbor for neighbor, link in self.neighbors[a]
+                if neighbor not in sources and 0 <= distance[neighbor] <= hops]
+
+    def next_hops_seen(self, a, b):         # The links of the problem, None when an earlier copy of the flood passed a
+        if self.seen_before(a, b):
+            if self.instruments is not None:
+                self.instruments.record('suppressed', self.internal_timer, a)
+            return None
+        return self.next_hops_problem(a, b)
+
+    def deliver_or_forward(self, a, b, next_hops):          # Delivers packet b at node a or copies it to next hops
+        if self.workload is not None:                       # The copy received ends here, its own copies are new
+            self.workload.receive(b)
+        b.dec_ttl()                                         # Decrements the ttl upon receival
+        if b.get_ttl() <= 0 and a == b.get_destination():   # Checks if packet has reached its life or destination
+            self.nodes[a].packets_received += 1             # Increments the packets received
+            if self.instruments is not None or self.workload is not None:
+                self.record_delivery(a, b)
+            del b                                           # Deletes the packet from the network
+        elif b.get_ttl() <= 0:                              # Checks if the packet has reached its ttl
+            if self.instruments is not None:
+                self.instruments.record('ttl_drop', self.internal_timer, a)
+            del b                                           # Deletes the packet from the network
+
+        elif self.nodes[a].get_node_id() == b.get_destination():    # Checks if packet has reached its destination
+            self.nodes[a].packets_received += 1                     # Increments the received packets counter
+            if self.instruments is not None or self.workload is not None:
+                self.record_delivery(a, b)
+            del b                                                   # Deletes the packet from the network
+
+        else:
+            if b.get_exec_time() == self.internal_timer:            # Checks if the packet has a current execution time
+                hops = next_hops(a, b)
+                if hops is None:                                    # The mode does not forward the packet at all
+                    return
+                b.set_exec_time(self.internal_timer + 1)            # Makes the packet execution time the next iteration
+                if self.instruments is not None:
+                    size = self.nodes[a].queue_size()
+                for neighbor in hops:                               # Copies the packet for all the valid links
+                    self.copy_packet(a, b, neighbor)
+                if self.instruments is not None:
+                    self.record_copies(a, self.nodes[a].queue_size() - size)
+                self.schedule(a, self.internal_timer + 1)
+
+    def seen_before(self, a, b):            # Checks the flood of packet b against the seen cache of node a
+        node = self.nodes[a]
+        if node.seen is None:
+            node.seen = SeenCache(self.seen_capacity, self.seen_age)
+        return node.seen.check(b.flood_id, self.internal_timer)
+
+    def new_flood_id(self, a):              # Returns the (source, sequence number) id of the next flood started at a
+        sequence = self.sequences.get(a, 0)
+        self.sequences[a] = sequence + 1
+        return a, sequence
+
+    def copy_packet(self, a, b, c):         # Queues a copy of packet b at node a for neighbor c, a full queue drops one
+        node = self.nodes[a]
+        if self.workload is not None:
+            self.workload.copy(b)
+        if self.queue_limit is not None and node.queue_size() >= self.queue_limit:
+            oldest = node.nodeQueue.pop_oldest() if self.drop_policy == 'head' else None
+            if oldest is None:                  # Tail drop, or nothing but the due packets is left to drop
+                self.drop_packet(a, b)
+                return
+            self.drop_packet(a, oldest)
+        node.copy_packet(b, c)
+
+    def drop_packet(self, a, b):            # Counts a packet dropped from the full queue of node a
+        self.drops += 1
+        if self.instruments is not None:
+            self.instruments.record('queue_drop', self.internal_timer, a)
+        if self.workload is not None:
+            self.workload.drop(b)
+
+    def record_delivery(self, a, b):            # Counts a packet reaching its destination a
+        if self.instruments is not None:
+            self.instruments.record('delivery', self.internal_timer, a)
+            self.instruments.observe('delivery_ttl', b.get_ttl())
+        if self.workload is not None:
+            self.workload.deliver(b, self.internal_timer)
+
+    def record_copies(self, a, copies):         # Counts the copies node a made of a forwarded packet
+        self.instruments.record('duplicate', self.internal_timer, a, count=copies)
+        self.instruments.observe('copies', copies)
+
+    def init_network(self, a, b):   # Used to initialize the network at the desired source
+        b.set_exec_time(self.internal_timer + 1)    # Sets the time of sending at the next iteration
+        for neighbor, link in self.neighbors[a]:                    # Applied to all the connected node links
+            self.copy_packet(a, b, neighbor)                        # Queues a packet to be sent to the other link end
+        self.schedule(a, self.internal_timer + 1)
+
+    def init_seen(self, a, b):      # Initializes the network at the source with a new flood id, unless b has one
+        if b.flood_id is None:
+            b.flood_id = self.new_flood_id(a)
+        self.seen_before(a, b)      # The source does not forward its own flood again
+        self.init_network(a, b)
+
+    def init_pruned(self, a, b):    # Initializes the network at the source with only the links which can arrive in time
+        b.set_exec_time(self.internal_timer + 1)
+        distance = self.distances_to(b.get_destination())
+        for neighbor, link in self.neighbors[a]:
+            if 0 <= distance[neighbor] <= b.get_ttl() - 1:
+                self.copy_packet(a, b, neighbor)
+        self.schedule(a, self.internal_timer + 1)
+
+    def print_output(self, destination=None):   # Used to print the Queues and the packets received at each iteration of time
+        if destination is None:                 # The last node is the destination of the built-in topology
+            destination = len(self.nodes) - 1
+        self.total_packets = 0
+        lines = []                              # Printed at once rather than line by line
+        sizes = self.queue_sizes()
+        for y in range(len(self.nodes)):
+            if y != destination:
+                lines.append('Node {:>2} - Queue-Size: {:>2}'.format(y, sizes[y]))
+                self.total_packets += sizes[y]
+        lines.append('Node ' + str(destination) + ' - Packets Received: ' + str(self.nodes[destination].packets_received))
+        lines.append('Total Packets in the Network: ' + str(self.total_packets))
+        print('\n'.join(lines))
+
+    def queue_sizes(self):      # Returns the queue size of every node
+        sizes = [0] * len(self.nodes)
+        for n, node in self.nodes.get_created():
+            sizes[n] = node.queue_size()
+        return sizes
+
+    def received_counts(self):  # Returns the packets received at every node
+        received = [0] * len(self.nodes)
+        for n, node in self.nodes.get_created():
+            received[n] = node.packets_received
+        return received
+
+    def clear_all(self):        # Used to clear all the queues of all nodes
+        for n, node in self.nodes.get_created():
+            node.nodeQueue.clear()
+            node.packets_received = 0
+            node.seen = None
+        self.internal_timer = 0
+        self.sequences = {}
+        self.transmissions = 0
+        self.drops = 0
+        self.clear_links()
+
+    def print_topology(self):
+        print("***************   Topology    **************")
+        for pn in range(len(self.nodes)):
+            print("Node: " + str(self.nodes[pn].get_node_id()) + " Links" + str(self.nodes[pn].get_node_links()))
+
+        print("************   End of Topology  ************\n")
+        print("NOTE!!!: Two runs will occur one simulating the problem the second the solution \n")
+
+
+# The forwarding modes, pruned only forwards copies which can arrive in time and seen only the first copy of a flood
+MODES = ('problem', 'solution', 'pruned', 'seen')
+DROP_POLICIES = ('tail', 'head')        # A full queue drops the arriving packet or the packet queued first
+
+
+class Scheduler:
+    """ Runs the network as a discrete event simulation, a priority queue holds the send events keyed on the execution
+        time so an iteration only visits the nodes which have packets due. The due nodes are served one after the other
+        in the alternating priority order, which reserves the links in a single pass and makes every run reproducible"""
+    def __init__(self, net, mode='problem'):
+        if mode not in MODES:
+            raise ValueError('Unknown forwarding mode: ' + str(mode))
+        self.net = net                  # The network being simulated
+        self.mode = mode                # Selects the forwarding rules, one of MODES
+        self.events = []                # Priority queue of (execution time, node) send events
+        self.scheduled = set()          # The events currently in the priority queue, avoids queueing a node twice
+        net.scheduler = self
+        for a, node in net.nodes.get_created():     # Picks up packets queued before the scheduler was attached
+            for b in node.get_all_queue():
+                self.schedule(a, b.get_exec_time())
+
+    def schedule(self, a, t):                   # Used to register that node a has a packet due at time t
+        if (t, a) not in self.scheduled:
+            self.scheduled.add((t, a))
+            heapq.heappush(self.events, (t, a))
+
+    def run_tick(self, run):                    # Executes all the send events due at iteration run
+        self.net.internal_timer = run
+        due = []
+        while self.events and self.events[0][0] <= run:
+            event = heapq.heappop(self.events)
+            self.scheduled.discard(event)
+            due.append(event[1])
+        due = sorted(set(due), reverse=run % 2 == 1)    # Nodes 0 - 14 on even iterations and 14 - 0 on odd ones
+        if self.mode == 'problem':
+            empty_queue = self.net.emtpy_queue_problem
+        elif self.mode == 'solution':
+            empty_queue = self.net.emtpy_queue_solution
+        elif self.mode == 'pruned':
+            empty_queue = self.net.emtpy_queue_pruned
+        else:
+            empty_queue = self.net.emtpy_queue_seen
+        for a in due:
+            empty_queue(a)
+        self.net.reset_links()                  # Reinitialize the links to false after the iteration
+
+    def run(self, ticks, start=0):              # Runs the iterations start - ticks - 1
+        for run in range(start, ticks):
+            self.run_tick(run)
+
+
+class PartitionNetwork(Network):
+    """ The part of a network simulated by one worker process of a partitioned run, it only holds the packets of the
+        nodes it owns. Receptions are held back until the end of the iteration and then applied in the node priority
+        order together with the packets sent in by the other partitions, so every node queues its copies in the same
+        order as in a single process run. A link between two partitions is given to the node with the higher priority
+        when it has a packet due for it, which both partitions work out from the due lanes exchanged between the
+        iterations"""
+    def __init__(self, node_count=15, link_count=28):
+        super().__init__(node_count, link_count)
+        self.owner = []                 # The partition of every node
+        self.partition = 0              # The partition simulated by this network
+        self.boundary = []              # (node, neighbor) pairs of the links leaving the partition
+        self.sender = 0                 # Node whose queue is being emptied
+        self.received = []              # (sender, receiver, packet) for every packet sent in this iteration
+
+    def set_partition(self, owner, partition):      # Used to select the nodes simulated by this network
+        self.owner = owner
+        self.partition = partition
+        self.boundary = sorted({(a, neighbor) for a in range(len(self.nodes)) if owner[a] == partition
+                                for neighbor, link in self.neighbors[a] if owner[neighbor] != partition})
+
+    def has_priority(self, a, b, t):            # Checks if node a empties its queue before node b at iteration t
+        return a < b if t % 2 == 0 else a > b
+
+    def due_lanes(self, t):                     # Returns the boundary pairs with a packet due at iteration t
+        due = []
+        for a, neighbor in self.boundary:
+            lanes = self.nodes[a].get_all_queue().buckets.get(t)
+            if lanes and lanes.get(neighbor):
+                due.append((a, neighbor))
+        return due
+
+    def reserve_links(self, remote_lanes, t):   # Makes busy the links a remote node with a higher priority sends over
+        for a, neighbor in remote_lanes:
+            if self.has_priority(a, neighbor, t):
+                c = self.find_link(neighbor, a)
+                self.links[c].set_status(True)
+                self.busy_links.append(c)
+
+    def empty_queue(self, a, send):
+        self.sender = a
+        super().empty_queue(a, send)
+
+    def receive_problem(self, a, b):            # Holds the packet back until the end of the iteration
+        self.received.append((self.sender, a, b))
+
+    def receive_solution(self, a, b):
+        self.received.append((self.sender, a, b))
+
+    def deliver(self, received, mode):          # Receives the packets sent to the nodes of this partition in priority order
+        if self.internal_timer % 2 == 0:
+            received.sort(key=lambda r: r[0])
+        else:
+            received.sort(key=lambda r: -r[0])
+        for sender, a, b in received:
+            if mode == 'problem':
+                Network.receive_problem(self, a, b)
+            else:
+                Network.receive_solution(self, a, b)
+
+
+class AggregateNetwork:
+    """ Count-only flooding engine for the problem part of the network, instead of a Packet object per copy every
+        directed link holds a FIFO of the ttl values waiting to cross it, next to the id of the packet they are a copy
+        of, which is all that separates two copies waiting at the same node for the same next hop. The FIFOs are
+        segments of one flat array, every segment sized for its own pair, so a hot spot only widens its own pairs. A
+        tick is a handful of array operations over every link at once, it keeps the rule of not sending back to the
+        last hop, the link capacities and the tail drop of full queues, so the queue sizes and packets received match
+        the Network engine tick for tick"""
+    SEGMENT = 4                         # Smallest FIFO segment of a pair
+
+    def __init__(self, net):
+        load_numpy('AggregateNetwork')
+        self.network = net              # The network the engine was built from, used for the hop distances
+        self.node_count = len(net.nodes)
+        self.internal_timer = 0         # Timer used to identify when a packet transmission is due
+        self.start_time = 0             # Iteration at which the packets placed by init_network are due
+        self.destination = 0            # Final destination of the flood
+        self.total_packets = 0          # Used for a counter to identify how many packets are in the network
+        self.transmissions = 0          # Counts the packets sent over a link
+        self.packets_received = np.zeros(self.node_count, dtype=np.int64)     # Packets received at every node
+        self.packet_destination = np.zeros(16, dtype=np.int64)  # Final destination of every packet id
+        self.packet_tag = np.zeros(16, dtype=np.int64)          # Workload id of every packet id, -1 for none
+        self.packet_count = 0           # Number of packet ids handed out
+        self.capacity = None            # Packets per iteration of every link, None for 1
+        self.queue_limit = None         # Packets a node queue holds, None for no limit
+        self.drops = 0                  # Packets dropped from full queues
+        self.workload = None            # Workload told about the packets of its flows delivered or dropped
+
+        self.link_count = len(net.links)
+        if net.topology is not None:
+            self.index_topology(net.topology)
+        else:
+            self.index_neighbors(net)
+
+        pair_count = len(self.pair_source)
+        self.start = np.arange(pair_count, dtype=np.int64) * self.SEGMENT   # Index of the segment of every pair
+        self.end = self.start + self.SEGMENT                        # Index one past the segment of every pair
+        self.fifo = np.zeros(pair_count * self.SEGMENT, dtype=np.int32)     # Ttl values waiting on the pairs
+        self.fifo_id = np.zeros(len(self.fifo), dtype=np.int32)     # Packet id of every ttl value in fifo
+        self.head = self.start.copy()           # Index of the next packet to be sent on every pair
+        self.tail = self.start.copy()           # Index one past the last queued packet of every pair
+
+    def index_topology(self, topology):         # Builds the pair and entry arrays from the adjacency arrays of topology
+        n = self.node_count
+        # CSR layout of the neighbors index, a node forwards one copy per entry in the same order as receive_problem
+        self.entry_start = np.frombuffer(topology.offsets, dtype=np.int64).copy()
+        self.entry_neighbor = np.frombuffer(topology.adjacent, dtype=np.int32).astype(np.int64)
+        source = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.entry_start))
+        # Every (node, neighbor) pair a packet can be sent over, parallel links are one pair on their lowest link id,
+        # which comes first in the slice of the node
+        keys, first, inverse = np.unique(source * n + self.entry_neighbor, return_index=True, return_inverse=True)
+        self.entry_pair = inverse.reshape(-1)
+        self.pair_source = keys // n
+        self.pair_target = keys % n
+        self.pair_link = np.frombuffer(topology.adjacent_link, dtype=np.int32)[first].astype(np.int64)
+
+    def index_neighbors(self, net):             # Builds the pair and entry arrays from the neighbor lists of net
+        pairs = sorted({(a, neighbor) for a in range(self.node_count) for neighbor, link in net.neighbors[a]})
+        pair_ids = {pair: p for p, pair in enumerate(pairs)}    # Every (node, neighbor) pair a packet can be sent over
+        self.pair_source = np.array([pair[0] for pair in pairs], dtype=np.int64)
+        self.pair_target = np.array([pair[1] for pair in pairs], dtype=np.int64)
+        self.pair_link = np.array([net.find_link(a, b) for a, b in pairs], dtype=np.int64)
+
+        # CSR layout of the neighbors index, a node forwards one copy per entry in the same order as receive_problem
+        self.entry_start = np.zeros(self.node_count + 1, dtype=np.int64)
+        self.entry_start[1:] = np.cumsum([len(entries) for entries in net.neighbors])
+        self.entry_neighbor = np.array([neighbor for entries in net.neighbors for neighbor, link in entries],
+                                       dtype=np.int64)
+        self.entry_pair = np.array([pair_ids[(a, neighbor)] for a, entries in enumerate(net.neighbors)
+                                    for neighbor, link in entries], dtype=np.int64)
+
+    def get_time(self):                         # Used to return the internal_timer
+        return self.internal_timer
+
+    def queue_sizes(self):                      # Returns the number of packets waiting at every node
+        return np.bincount(self.pair_source, weights=self.tail - self.head,
+                           minlength=self.node_count).astype(np.int64)
+
+    def clear_all(self):                        # Used to clear all the queues of all nodes
+        self.head[:] = self.start
+        self.tail[:] = self.start
+        self.packets_received[:] = 0
+        self.internal_timer = 0
+        self.transmissions = 0
+        self.packet_count = 0
+        self.drops = 0
+
+    def set_link_capacity(self, capacity, links=None):  # Sets the packets per iteration of the links, None is all links
+        if capacity < 1:
+            raise ValueError('A link has to carry at least one packet per iteration')
+        if self.capacity is None:
+            self.capacity = np.ones(self.link_count, dtype=np.int64)
+        self.capacity[slice(None) if links is None else list(links)] = capacity
+
+    def set_queue_limit(self, limit, policy='tail'):    # Bounds the queue of every node, None removes the bound
+        if policy != 'tail':
+            raise ValueError('AggregateNetwork only supports the tail drop policy')
+        self.queue_limit = limit
+
+    def minimal_ttl(self, source, destination):     # Returns the smallest ttl a flood needs to reach the destination
+        return self.network.minimal_ttl(source, destination)
+
+    def enqueue(self, pairs, ttls, ids):        # Appends copies to the pair FIFOs, pairs must be sorted by pair
+        if len(pairs) == 0:
+            return
+        counts = np.bincount(pairs, minlength=len(self.tail))
+        empty = self.head == self.tail          # An empty FIFO starts again at the start of its segment
+        self.head[empty] = self.start[empty]
+        self.tail[empty] = self.start[empty]
+        if (self.tail + counts > self.end).any():
+            self.grow(counts)
+        slots = self.tail[pairs] + group_index(pairs)       # Index among the entries of the same pair
+        self.fifo[slots] = ttls
+        self.fifo_id[slots] = ids
+        self.tail += counts
+        if self.workload is not None:
+            tags = self.packet_tag[ids]
+            self.workload.copy_many(tags[tags >= 0])
+
+    def grow(self, counts):                     # Packs every FIFO at the start of a segment sized for its own length
+        lengths = self.tail - self.head         # plus the counts about to be appended, twice over
+        size = np.maximum(2 * (lengths + counts), self.SEGMENT)
+        start = np.cumsum(size) - size
+        pair = np.repeat(np.arange(len(lengths)), lengths)
+        position = np.arange(len(pair)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        for name in ('fifo', 'fifo_id'):
+            old = getattr(self, name)
+            new = np.zeros(int(size.sum()), dtype=old.dtype)
+            new[start[pair] + position] = old[self.head[pair] + position]
+            setattr(self, name, new)
+        self.start = start
+        self.end = start + size
+        self.head = start.copy()
+        self.tail = start + lengths
+
+    def new_packet(self, destination, tag=-1):  # Hands out the id of a new packet
+        if self.packet_count == len(self.packet_destination):
+            self.packet_destination = np.resize(self.packet_destination, 2 * self.packet_count)
+            self.packet_tag = np.resize(self.packet_tag, 2 * self.packet_count)
+        self.packet_destination[self.packet_count] = destination
+        self.packet_tag[self.packet_count] = tag
+        self.packet_count += 1
+        return self.packet_count - 1
+
+    def init_network(self, a, b):               # Used to initialize the network at the desired source with packet b
+        self.start_time = self.internal_timer + 1
+        self.destination = b.get_destination()
+        self.inject(a, b.get_ttl(), b.get_destination())
+
+    def inject(self, a, ttl, destination, tag=-1):  # Queues a copy of a new packet for every link of node a
+        packet = self.new_packet(destination, tag)
+        entries = np.arange(self.entry_start[a], self.entry_start[a + 1])
+        if self.queue_limit is not None:        # The copies which do not fit in the queue are dropped
+            room = max(0, self.queue_limit - int((self.tail - self.head)[self.pair_source == a].sum()))
+            if room < len(entries):
+                self.dropped(np.full(len(entries) - room, packet))
+                entries = entries[:room]
+        order = np.argsort(self.entry_pair[entries], kind='stable')
+        self.enqueue(self.entry_pair[entries][order], np.full(len(entries), ttl, dtype=self.fifo.dtype),
+                     np.full(len(entries), packet, dtype=self.fifo_id.dtype))
+
+    def dropped(self, packets):                 # Counts the copies of packets dropped from full queues
+        self.drops += len(packets)
+        if self.workload is not None:
+            tags = self.packet_tag[packets]
+            self.workload.drop_many(tags[tags >= 0])
+
+    def run_tick(self, run):                    # Sends the packets every link with traffic carries at iteration run
+        self.internal_timer = run
+        if run < self.start_time:
+            return
+        if run % 2 == 0:                        # Gives the nodes from 0 - 14 the priority in incrementing order
+            rank = self.pair_source
+            node_rank = np.arange(self.node_count)
+        else:                                   # Gives the nodes from 14 - 0 the priority in decrementing order
+            rank = -self.pair_source
+            node_rank = -np.arange(self.node_count)
+
+        waiting = np.nonzero(self.tail > self.head)[0]
+        if len(waiting) == 0:
+            return
+        sizes = self.queue_sizes()              # Queue of every node before the iteration
+        order = np.lexsort((rank[waiting], self.pair_link[waiting]))
+        waiting = waiting[order]                # The node with the higher priority gets a shared link first
+        links = self.pair_link[waiting]
+        if self.capacity is None:               # One packet per link, the first pair of every link sends
+            first = np.ones(len(waiting), dtype=bool)
+            first[1:] = links[1:] != links[:-1]
+            sent = waiting[first]
+            take = np.ones(len(sent), dtype=np.int64)
+        else:                                   # Every pair sends what the pairs before it left of the capacity
+            lengths = self.tail[waiting] - self.head[waiting]
+            before = np.cumsum(lengths) - lengths
+            start = np.ones(len(waiting), dtype=bool)
+            start[1:] = links[1:] != links[:-1]
+            before -= np.maximum.accumulate(np.where(start, before, 0))
+            take = np.clip(self.capacity[links] - before, 0, lengths)
+            sent = waiting[take > 0]
+            take = take[take > 0]
+
+        order = np.argsort(rank[sent], kind='stable')   # Receptions happen in the order the senders are served
+        sent, take = sent[order], take[order]
+        pair = np.repeat(sent, take)            # One entry per packet sent, in the order of the pair FIFOs
+        position = np.arange(len(pair)) - np.repeat(np.cumsum(take) - take, take)
+        slots = self.head[pair] + position
+        ttl = self.fifo[slots] - 1              # Decrements the ttl upon receival
+        packet = self.fifo_id[slots]
+        self.transmissions += len(pair)
+        if self.workload is not None:           # The copies sent end at the receiver, their own copies are new
+            tags = self.packet_tag[packet]
+            self.workload.receive_many(tags[tags >= 0])
+        self.head[sent] += take
+        sender = self.pair_source[pair]
+        receiver = self.pair_target[pair]
+        arrived = receiver == self.packet_destination[packet]
+        self.packets_received += np.bincount(receiver[arrived], minlength=self.node_count)
+        if self.workload is not None:
+            tags = self.packet_tag[packet[arrived]]
+            self.workload.deliver_many(tags[tags >= 0], run)
+
+        forward = (ttl > 0) & ~arrived
+        sender, receiver, ttl, packet = sender[forward], receiver[forward], ttl[forward], packet[forward]
+        degree = self.entry_start[receiver + 1] - self.entry_start[receiver]
+        copy = np.repeat(np.arange(len(receiver)), degree)  # One copy per link of the receiving node
+        entry = self.entry_start[receiver][copy] + np.arange(len(copy)) - np.repeat(np.cumsum(degree) - degree, degree)
+        keep = self.entry_neighbor[entry] != sender[copy]   # Checks the packet last node place
+        copy, entry = copy[keep], entry[keep]
+
+        if self.queue_limit is not None and len(copy):
+            sent_by = np.bincount(self.pair_source[sent], weights=take, minlength=self.node_count).astype(np.int64)
+            copy, entry = self.tail_drop(copy, entry, sender, receiver, packet, sizes, sent_by, node_rank)
+        pairs = self.entry_pair[entry]
+        order = np.argsort(pairs, kind='stable')            # Receptions are queued in the sending order
+        self.enqueue(pairs[order], ttl[copy][order], packet[copy][order])
+
+    def tail_drop(self, copy, entry, sender, receiver, packet, sizes, sent, node_rank):
+        # Drops the copies which find the queue of their node full. A node sends its own packets when its turn comes,
+        # so the copies from the nodes served before it find the queue as it was at the start of the iteration plus
+        # the copies accepted so far, the copies from the nodes served after it find the queue less what it sent
+        node = receiver[copy]
+        late = node_rank[sender[copy]] > node_rank[node]
+        group = node * 2 + late                 # The copies of a node arriving before its turn come first
+        order = np.argsort(group, kind='stable')
+        copy, entry, node, late, group = copy[order], entry[order], node[order], late[order], group[order]
+        early = np.clip(self.queue_limit - sizes, 0, np.bincount(node[~late], minlength=self.node_count))
+        room = np.maximum(self.queue_limit - (sizes + early - sent), 0)
+        accept = group_index(group) < np.where(late, room[node], early[node])
+        if not accept.all():
+            self.dropped(packet[copy[~accept]])
+        return copy[accept], entry[accept]
+
+
+def group_index(keys):                  # Returns the index of every entry of a sorted array among the equal entries
+    index = np.arange(len(keys))
+    start = np.ones(len(keys), dtype=bool)
+    start[1:] = keys[1:] != keys[:-1]
+    return index - np.maximum.accumulate(np.where(start, index, 0))
+
+
+class Channel:
+    """ A link of the emulation, in every iteration it shares its bandwidth among the lanes offered by its two ends in
+        the node priority order, and it holds the packets on their way to every end in a FIFO of (arrival iteration,
+        sending order, packet)"""
+    __slots__ = ('link', 'delay', 'offers', 'flight')
+
+    def __init__(self, link, delay):
+        self.link = link                # Id of the link carried by the channel
+        self.delay = delay              # Iterations from sending a packet to forwarding its copies at the other end
+        self.offers = []                # (rank, node, next hop, packets) offered in the current iteration
+        self.flight = {}                # Maps a receiving node to the deque of the packets on their way to it
+
+    def grant(self, capacity, grants):  # Gives the capacity to the offers, the node with the higher priority first
+        self.offers.sort()
+        for rank, a, hop, count in self.offers:
+            grants[(a, hop)] = min(count, capacity)
+            capacity -= grants[(a, hop)]
+        self.offers = []
+
+    def land(self, a, arrival, order, b):   # Puts packet b on its way to node a
+        flight = self.flight.get(a)
+        if flight is None:
+            flight = self.flight[a] = deque()
+        flight.append((arrival, order, b))
+
+    def take(self, a, t):               # Returns the packets arriving at node a at iteration t
+        flight = self.flight[a]
+        arrived = []
+        while flight and flight[0][0] <= t:
+            arrived.append(flight.popleft())
+        if not flight:
+            del self.flight[a]
+        return arrived
+
+
+class LocalTransport:
+    """ Hands the packets sent by the emulated nodes straight to their channel"""
+    async def open(self, emulator):
+        self.emulator = emulator
+
+    def put(self, channel, a, arrival, order, b):   # Sends packet b over channel to node a
+        channel.land(a, arrival, order, b)
+
+    async def flush(self):              # Returns once the packets put in the iteration landed
+        pass
+
+    def close(self):
+        pass
+
+
+class UdpTransport:
+    """ Carries the packets sent by the emulated nodes over a UDP socket on the loopback interface, the socket sends to
+        itself. Every packet is encoded into a record of its fields and the source list, the records of an iteration
+        are packed into datagrams which are sent one at a time at the end of the send phase, a packet lands on its
+        channel when its datagram comes back so the sending order is kept"""
+    RECORD = struct.Struct('<iiiiiiiiBiqI')     # link, receiver, arrival, tick, rank, ttl, source, destination,
+    DATAGRAM = 65000                            # flood id flag, flood source, flood sequence, source list length
+    TIMEOUT = 5.0                               # Seconds a datagram may take before it is taken as lost
+
+    def __init__(self, host='127.0.0.1'):
+        self.host = host                # Loopback address the socket is bound to
+        self.emulator = None            # The emulator the packets are landed in
+        self.transport = None           # The asyncio datagram transport of the socket
+        self.address = None             # Address the socket is bound to, the datagrams are sent there
+        self.datagrams = []             # Datagrams of the records put in the current iteration
+        self.records = bytearray()      # Records not packed into a datagram yet
+        self.waiter = None              # Future set once the datagram in flight came back
+        self.datagrams_sent = 0         # Datagrams sent over the socket
+        self.bytes_sent = 0             # Bytes of the datagrams sent over the socket
+
+    async def open(self, emulator):     # Binds the socket, the transport is its own datagram protocol
+        import asyncio
+        self.emulator = emulator
+        loop = asyncio.get_running_loop()
+        self.transport, protocol = await loop.create_datagram_endpoint(lambda: self, local_addr=(self.host, 0))
+        self.address = self.transport.get_extra_info('sockname')
+
+    def put(self, channel, a, arrival, order, b):
+        flood = b.flood_id if b.flood_id is not None else (0, 0)
+        sources = list(b.source_list)
+        record = self.RECORD.pack(channel.link, a, arrival, order[0], order[1], b.ttl, b.source, b.final_destination,
+                                  b.flood_id is not None, flood[0], flood[1], len(sources))
+        record += array('i', sources).tobytes()
+        if len(self.records) + len(record) > self.DATAGRAM:
+            self.datagrams.append(bytes(self.records))
+            self.records = bytearray()
+        self.records += record
+
+    async def flush(self):
+        import asyncio
+        if self.records:
+            self.datagrams.append(bytes(self.records))
+            self.records = bytearray()
+        datagrams, self.datagrams = self.datagrams, []
+        for datagram in datagrams:
+            self.waiter = asyncio.get_running_loop().create_future()
+            self.transport.sendto(datagram, self.address)
+            self.datagrams_sent += 1
+            self.bytes_sent += len(datagram)
+            try:
+                await asyncio.wait_for(self.waiter, self.TIMEOUT)
+            except asyncio.TimeoutError:
+                raise ConnectionError('A datagram was lost on the loopback interface') from None
+
+    def connection_made(self, transport):
+        pass
+
+    def datagram_received(self, data, address):     # Decodes the records and lands their packets on the channels
+        offset = 0
+        while offset < len(data):
+            (c, a, arrival, tick, rank, ttl, source, destination, has_flood, flood_source, flood_sequence,
+             length) = self.RECORD.unpack_from(data, offset)
+            offset += self.RECORD.size
+            b = Packet()
+            b.ttl = ttl
+            b.source = source
+            b.final_destination = destination
+            b.next_destination = a
+            if has_flood:
+                b.flood_id = (flood_source, flood_sequence)
+            for node in array('i', data[offset:offset + 4 * length]):
+                b.reg_source(node)
+            offset += 4 * length
+            self.emulator.channels[c].land(a, arrival, (tick, rank), b)
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def error_received(self, exc):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_exception(exc)
+
+    def connection_lost(self, exc):
+        pass
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+
+class Emulator:
+    """ Runs the network as concurrent processes on asyncio, every node with traffic is a task and every link a channel
+        with a propagation delay and a bandwidth, the packets per iteration of the link capacity. An iteration has
+        three phases, the due nodes offer their lanes to the channels, which grant their bandwidth in the node priority
+        order, the nodes send what was granted, and the nodes with packets arriving take them in the priority order of
+        their senders and forward them with the receive rules of the mode. The task of a node ends once it has no
+        packets queued or on their way to it, so memory follows the traffic and not the size of the network. With a
+        delay of one iteration on every link and unbounded queues the run matches the Scheduler tick for tick"""
+    def __init__(self, net, mode='problem', delay=1, bandwidth=None, transport=None):
+        if mode not in MODES:
+            raise ValueError('Unknown forwarding mode: ' + str(mode))
+        if delay < 1:
+            raise ValueError('A link has to delay a packet at least one iteration')
+        self.net = net                  # The network being emulated
+        self.mode = mode                # Selects the forwarding rules, one of MODES
+        self.receive = getattr(net, 'receive_' + mode)
+        self.delay = delay              # Delay of the links not given one by set_link_delay
+        self.delays = {}                # Delay of the links given one by set_link_delay
+        self.transport = LocalTransport() if transport is None else transport
+        self.channels = {}              # Maps a link id to its Channel, made when the link is first used
+        self.offered = []               # Channels with offers in the current iteration
+        self.grants = {}                # Maps a (node, next hop) lane to the packets it may send in this iteration
+        self.lanes = {}                 # Maps a node to the lanes it offered in the current iteration
+        self.due = {}                   # Maps an iteration to the nodes with packets due
+        self.arrivals = {}              # Maps an iteration to the nodes with packets arriving
+        self.inbound = {}               # Maps a node to the channels with packets on their way to it
+        self.tasks = {}                 # Maps a node to the (inbox, task) of its process, for the nodes with traffic
+        self.phase = None               # Future set once every node told of the current phase handled it
+        self.pending = 0                # Nodes which did not handle the current phase yet
+        self.peak_tasks = 0             # Most node tasks running at once
+        if bandwidth is not None:
+            net.set_link_capacity(bandwidth)
+        net.scheduler = self
+        for a, node in net.nodes.get_created():     # Picks up packets queued before the emulator was attached
+            for b in node.get_all_queue():
+                self.schedule(a, b.get_exec_time())
+
+    def schedule(self, a, t):                   # Used to register that node a has a packet due at time t
+        nodes = self.due.get(t)
+        if nodes is None:
+            nodes = self.due[t] = set()
+        nodes.add(a)
+
+    def set_link_delay(self, delay, links=None):    # Sets the delay in iterations of the links, all if links is None
+        if delay < 1:
+            raise ValueError('A link has to delay a packet at least one iteration')
+        if links is None:
+            self.delay = delay
+            self.delays = {}
+        else:
+            for c in links:
+                self.delays[c] = delay
+        for c, channel in self.channels.items():
+            channel.delay = self.delays.get(c, self.delay)
+
+    def channel(self, c):                       # Returns the channel of link c
+        channel = self.channels.get(c)
+        if channel is None:
+            channel = self.channels[c] = Channel(c, self.delays.get(c, self.delay))
+        return channel
+
+    async def open(self):                       # Opens the transport, before the first iteration
+        await self.transport.open(self)
+
+    async def close(self):                      # Ends the node tasks and closes the transport
+        import asyncio
+        tasks = []
+        for inbox, task in self.tasks.values():
+            inbox.put_nowait((None, None))
+            tasks.append(task)
+        self.tasks = {}
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.transport.close()
+
+    async def node(self, a, inbox):             # The process of node a, runs the phases it is told of until it is idle
+        while True:
+            phase, t = await inbox.get()
+            if phase is None:
+                return
+            try:
+                phase(a, t)
+            except BaseException as e:
+                if not self.phase.done():
+                    self.phase.set_exception(e)
+                raise
+            self.pending -= 1
+            if self.pending == 0:
+                self.phase.set_result(None)
+
+    async def run_phase(self, phase, nodes, t):     # Tells the nodes to run a phase and waits until they all did
+        import asyncio
+        if not nodes:
+            return
+        self.phase = asyncio.get_running_loop().create_future()
+        self.pending = len(nodes)
+        for a in nodes:
+            entry = self.tasks.get(a)
+            if entry is None:
+                inbox = asyncio.Queue()
+                entry = self.tasks[a] = (inbox, asyncio.get_running_loop().create_task(self.node(a, inbox)))
+            entry[0].put_nowait((phase, t))
+        await self.phase
+
+    async def run_tick(self, run):              # Runs iteration run
+        self.net.internal_timer = run
+        due = sorted(self.due.pop(run, ()))
+        await self.run_phase(self.offer, due, run)
+        for channel in self.offered:
+            channel.grant(self.net.links[channel.link].capacity if self.net.wide_links else 1, self.grants)
+        self.offered = []
+        await self.run_phase(self.send, due, run)
+        self.grants = {}
+        await self.transport.flush()
+        receivers = self.arrivals.pop(run, set())
+        await self.run_phase(self.take, sorted(receivers), run)
+        self.peak_tasks = max(self.peak_tasks, len(self.tasks))
+        for a in receivers.union(due):          # The tasks of the nodes left without traffic end
+            if a in self.tasks and a not in self.inbound and self.net.nodes[a].queue_size() == 0:
+                self.tasks.pop(a)[0].put_nowait((None, None))
+
+    async def run(self, ticks, start=0):        # Runs the iterations start - ticks - 1
+        for run in range(start, ticks):
+            await self.run_tick(run)
+
+    def offer(self, a, t):                      # Offers the lanes of node a due at iteration t to their channels
+        due = self.net.nodes[a].get_all_queue().pop_due(t)
+        if not due:
+            return
+        self.lanes[a] = due
+        rank = a if t % 2 == 0 else -a          # Nodes 0 - 14 on even iterations and 14 - 0 on odd ones
+        for hop, lane in due.items():
+            channel = self.channel(self.net.find_link(a, hop))
+            if not channel.offers:
+                self.offered.append(channel)
+            channel.offers.append((rank, a, hop, len(lane)))
+
+    def send(self, a, t):                       # Sends the packets of node a granted at iteration t
+        due = self.lanes.pop(a, None)
+        if due is None:
+            return
+        net = self.net
+        queue = net.nodes[a].get_all_queue()
+        order = (t, a if t % 2 == 0 else -a)    # The receivers take the packets in the priority order of the senders
+        for hop, lane in due.items():
+            channel = self.channels[net.find_link(a, hop)]
+            granted = self.grants.get((a, hop), 0)
+            if granted:
+                arrival = t + channel.delay - 1     # Forwarded at the other end delay iterations after sending
+                for _ in range(granted):
+                    b = lane.popleft()
+                    queue.size -= 1
+                    if self.mode == 'solution' or self.mode == 'pruned':
+                        b.reg_source(a)
+                    else:
+                        b.set_source(a)
+                    net.transmissions += 1
+                    if net.instruments is not None:
+                        net.instruments.record('send', t, a, channel.link)
+                    self.transport.put(channel, hop, arrival, order, b)
+                channels = self.inbound.get(hop)
+                if channels is None:
+                    channels = self.inbound[hop] = set()
+                channels.add(channel.link)
+                receivers = self.arrivals.get(arrival)
+                if receivers is None:
+                    receivers = self.arrivals[arrival] = set()
+                receivers.add(hop)
+            if net.instruments is not None and lane:    # Every packet left in the lane waits for the link
+                net.instruments.record('retry', t, a, channel.link, len(lane))
+        queue.requeue(due, t + 1)               # The rest of the lanes is sent next iteration
+        if t + 1 in queue.buckets:
+            self.schedule(a, t + 1)
+
+    def take(self, a, t):                       # Receives the packets arriving at node a at iteration t
+        arrived = []
+        channels = self.inbound[a]
+        for c in list(channels):
+            channel = self.channels[c]
+            arrived.extend(channel.take(a, t))
+            if a not in channel.flight:
+                channels.discard(c)
+        if not channels:
+            del self.inbound[a]
+        arrived.sort(key=lambda packet: packet[1])
+        for arrival, order, b in arrived:
+            b.exec_time = t
+            self.receive(a, b)
+
+
+class Instruments:
+    """ Counters of what happens inside a run, attached with net.instruments = Instruments(). The network reports the
+        packets sent, the packets pushed back to the next iteration because their link was busy (retry), the copies
+        made when a packet is forwarded (duplicate), the packets reaching their ttl (ttl_drop), the packets reaching
+        their destination (delivery), the copies dropped by a node which already forwarded their flood (suppressed)
+        and the packets dropped from a full queue (queue_drop). Events are counted per node, per link and per
+        iteration, so the contention hotspots of a run can be found and exported as a time series. A network without
+        instruments skips all of it"""
+    EVENTS = ('send', 'retry', 'duplicate', 'ttl_drop', 'delivery', 'suppressed', 'queue_drop')
+    LINK_EVENTS = ('send', 'retry')             # The events which happen on a link
+    HISTOGRAMS = ('delivery_ttl', 'copies')     # The ttl left at delivery and the copies made per forwarded packet
+
+    def __init__(self):
+        self.by_node = {event: Counter() for event in self.EVENTS}
+        self.by_link = {event: Counter() for event in self.LINK_EVENTS}
+        self.by_tick = {event: Counter() for event in self.EVENTS}
+        self.by_tick_link = {event: Counter() for event in self.LINK_EVENTS}    # Keyed on (tick, link)
+        self.histograms = {name: Counter() for name in self.HISTOGRAMS}
+        self.subscribers = []           # Called as callback(event, tick, node, link, count) on every event
+
+    def subscribe(self, callback):      # Registers a function called on every event
+        self.subscribers.append(callback)
+
+    def record(self, event, tick, node, link=None, count=1):     # Counts count events of node a at iteration tick
+        self.by_node[event][node] += count
+        self.by_tick[event][tick] += count
+        if link is not None:
+            self.by_link[event][link] += count
+            self.by_tick_link[event][tick, link] += count
+        for callback in self.subscribers:
+            callback(event, tick, node, link, count)
+
+    def observe(self, histogram, value):    # Adds a value to a histogram
+        self.histograms[histogram][value] += 1
+
+    def clear(self):
+        for counters in (self.by_node, self.by_link, self.by_tick, self.by_tick_link, self.histograms):
+            for counter in counters.values():
+                counter.clear()
+
+    def hot_links(self, k=10, event='retry'):       # The k links with the most events, as (link, count) pairs
+        return self.by_link[event].most_common(k)
+
+    def hot_nodes(self, k=10, event='retry'):       # The k nodes with the most events, as (node, count) pairs
+        return self.by_node[event].most_common(k)
+
+    def get_ticks(self):                # The iterations 0 up to the last iteration with an event
+        last = max((max(counter) for counter in self.by_tick.values() if counter), default=-1)
+        return range(last + 1)
+
+    def time_series(self, ticks=None):  # Returns the count of every event per iteration as a dict of columns
+        if ticks is None:
+            ticks = self.get_ticks()
+        series = {'tick': list(ticks)}
+        for event in self.EVENTS:
+            series[event] = [self.by_tick[event][tick] for tick in series['tick']]
+        return series
+
+    def write_csv(self, path, ticks=None):  # Writes the time series with one row per iteration
+        import csv
+        series = self.time_series(ticks)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(list(series))
+            writer.writerows(zip(*series.values()))
+
+    def write_link_csv(self, path):     # Writes the link events with one row per iteration and used link
+        import csv
+        keys = sorted(set(self.by_tick_link['send']) | set(self.by_tick_link['retry']))
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tick', 'link', 'send', 'retry'])
+            for key in keys:
+                writer.writerow([key[0], key[1], self.by_tick_link['send'][key], self.by_tick_link['retry'][key]])
+
+
+class TextSink:
+    """ Output sink printing the queue of every node and the packets received at the destination after every
+        iteration, the human readable output of the simulator"""
+    def __init__(self, destination=None, interval=1):
+        self.destination = destination  # Node whose received packets are printed, the last node if None
+        self.interval = interval        # Only every interval-th iteration is printed
+
+    def record(self, net, tick):        # Prints the state of the network after iteration tick
+        if tick % self.interval == 0:
+            print('\n**********       Time:  ' + str(tick) + '            **********\n')
+            net.print_output(self.destination)
+
+    def close(self):
+        pass
+
+
+class NullSink:
+    """ Output sink which drops everything, used for benchmark runs"""
+    def record(self, net, tick):
+        pass
+
+    def close(self):
+        pass
+
+
+class TraceWriter:
+    """ Output sink writing a columnar binary trace, a directory with one raw little endian file per column and a
+        meta.json describing them. Every sampled iteration adds its tick, the queue size and packets received of every
+        node and the ids of the links used in the iteration. The columns are buffered in arrays and written when the
+        buffer is full, read_trace loads them back as numpy arrays"""
+    COLUMNS = {'ticks': 'q', 'queue_sizes': 'i', 'packets_received': 'q', 'busy_counts': 'q', 'busy_links': 'i'}
+
+    def __init__(self, path, interval=1, buffer_size=1 << 20):
+        self.path = path                # Directory the trace is written to
+        self.interval = interval        # Only every interval-th iteration is recorded
+        self.buffer_size = buffer_size  # Number of bytes buffered before the columns are written
+        self.buffers = {name: array(code) for name, code in self.COLUMNS.items()}
+        self.files = None               # Column files, opened by the first record
+
+    def open(self, net):                # Creates the trace directory and describes the columns
+        import json
+        os.makedirs(self.path, exist_ok=True)
+        meta = {'node_count': len(net.nodes), 'link_count': len(net.links), 'interval': self.interval,
+                'byteorder': sys.byteorder,
+                'columns': {name: array(code).itemsize for name, code in self.COLUMNS.items()}}
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        self.files = {name: open(os.path.join(self.path, name + '.bin'), 'wb') for name in self.COLUMNS}
+
+    def record(self, net, tick):        # Buffers the state of the network after iteration tick
+        if tick % self.interval != 0:
+            return
+        if self.files is None:
+            self.open(net)
+        self.buffers['ticks'].append(tick)
+        self.buffers['queue_sizes'].extend(net.queue_sizes())
+        self.buffers['packets_received'].extend(net.received_counts())
+        self.buffers['busy_counts'].append(len(net.used_links))
+        self.buffers['busy_links'].extend(net.used_links)
+        if sum(len(b) * b.itemsize for b in self.buffers.values()) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):                    # Writes the buffered columns to their files
+        if self.files is None:
+            return
+        for name, buffer in self.buffers.items():
+            buffer.tofile(self.files[name])
+            del buffer[:]
+
+    def close(self):
+        self.flush()
+        if self.files is not None:
+            for f in self.files.values():
+                f.close()
+            self.files = None
+
+
+def read_trace(path):                   # Loads a trace written by TraceWriter as a dict of numpy arrays
+    load_numpy('read_trace')
+    import json
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    order = '<' if meta['byteorder'] == 'little' else '>'
+    trace = {}
+    for name, size in meta['columns'].items():
+        trace[name] = np.fromfile(os.path.join(path, name + '.bin'), dtype=order + 'i' + str(size))
+    samples = len(trace['ticks'])
+    trace['queue_sizes'] = trace['queue_sizes'].reshape(samples, meta['node_count'])
+    trace['packets_received'] = trace['packets_received'].reshape(samples, meta['node_count'])
+    # busy_links[busy_offsets[i]:busy_offsets[i + 1]] are the links used in sample i
+    trace['busy_offsets'] = np.concatenate(([0], np.cumsum(trace['busy_counts'])))
+    trace['link_utilization'] = np.bincount(trace['busy_links'], minlength=meta['link_count']) / max(samples, 1)
+    trace['meta'] = meta
+    return trace
+
+
+class Snapshot:
+    """ Compact binary image of a Network between two iterations, the timer and counters, the links with their status,
+        load, capacity and packets received, and the queues, counters and seen caches of the nodes. A snapshot file is
+        a json header followed by one column of native machine values per field, load maps the file into memory and
+        reads the columns in place. The source lists of the packets are kept as one table of chain entries, so the
+        history shared by packet copies is stored once. Every restore makes a network of its own, but the restored
+        networks share the Topology and the source list entries, which are never changed, and only make their own
+        packets, queues and link arrays"""
+    MAGIC = b'FNSNAP02'
+    COLUMNS = {'link_source': 'i', 'link_target': 'i', 'offsets': 'q', 'adjacent': 'i', 'adjacent_link': 'i',
+               'link_status': 'B', 'link_load': 'i', 'link_capacity': 'i', 'link_received': 'q', 'used_links': 'i',
+               'node_id': 'i', 'node_received': 'q', 'node_packets': 'q', 'node_seen': 'q',
+               'node_seen_capacity': 'q', 'node_seen_age': 'q', 'node_arrivals': 'q', 'packet_time': 'q',
+               'packet_next': 'i', 'packet_ttl': 'i', 'packet_source': 'i', 'packet_destination': 'i',
+               'packet_sources': 'i', 'packet_flood_source': 'i', 'packet_flood_sequence': 'q', 'packet_arrival': 'q',
+               'chain_node': 'i', 'chain_parent': 'i',
+               'seen_source': 'i', 'seen_sequence': 'q', 'seen_time': 'q', 'sequence_node': 'i',
+               'sequence_next': 'q'}
+
+    def __init__(self, meta, columns, buffer=None):
+        self.meta = meta                # Scalars of the network and the layout of the columns
+        self.columns = columns          # Maps a column name to an array or a memoryview of its values
+        self.buffer = buffer            # The mmap the columns are read from, None when they are arrays
+        self.topology = None            # Topology shared by the restored networks, made by the first restore
+        self.chains = None              # SourceList of every chain entry, shared by the restored networks
+
+    @classmethod
+    def take(cls, net):                 # Captures the state of network net
+        columns = {name: array(code) for name, code in cls.COLUMNS.items()}
+        meta = {'node_count': len(net.nodes), 'link_count': len(net.links), 'internal_timer': net.internal_timer,
+                'total_packets': net.total_packets, 'transmissions': net.transmissions, 'drops': net.drops,
+                'seen_capacity': net.seen_capacity, 'seen_age': net.seen_age, 'wide_links': net.wide_links,
+                'queue_limit': net.queue_limit, 'drop_policy': net.drop_policy,
+                'links': 'topology' if net.topology is not None else 'lists', 'byteorder': sys.byteorder}
+        if net.topology is not None:    # The links are the arrays of a Topology
+            topology = net.topology
+            columns['link_source'].extend(topology.link_source)
+            columns['link_target'].extend(topology.link_target)
+            columns['offsets'].extend(topology.offsets)
+            columns['adjacent'].extend(topology.adjacent)
+            columns['adjacent_link'].extend(topology.adjacent_link)
+            table = net.links
+            columns['link_status'].frombytes(bytes(table.status))
+            columns['link_received'].extend(table.packets_received)
+            meta['capacity'] = table.capacity is not None
+            if table.capacity is not None:
+                columns['link_capacity'].extend(table.capacity)
+                columns['link_load'].extend(table.load)
+        else:                           # The links are Link objects and the neighbors lists in the order they were made
+            meta['capacity'] = True
+            for link in net.links:
+                ends = link.get_connection()
+                columns['link_source'].append(ends[0] if ends else -1)
+                columns['link_target'].append(ends[1] if ends else -1)
+                columns['link_status'].append(1 if link.status else 0)
+                columns['link_load'].append(link.load)
+                columns['link_capacity'].append(link.capacity)
+                columns['link_received'].append(link.packets_received)
+            columns['offsets'].append(0)
+            for entries in net.neighbors:
+                for neighbor, link in entries:
+                    columns['adjacent'].append(neighbor)
+                    columns['adjacent_link'].append(link)
+                columns['offsets'].append(len(columns['adjacent']))
+        columns['used_links'].extend(net.used_links)
+        for a, sequence in sorted(net.sequences.items()):
+            columns['sequence_node'].append(a)
+            columns['sequence_next'].append(sequence)
+
+        chains = {}                     # Maps the id of a chain entry to its index in the chain table
+        for a, node in sorted(net.nodes.get_created()):
+            columns['node_id'].append(a)
+            columns['node_received'].append(node.packets_received)
+            columns['node_packets'].append(node.queue_size())
+            columns['node_arrivals'].append(node.nodeQueue.arrivals)
+            for t, lanes in node.nodeQueue.buckets.items():
+                for hop, lane in lanes.items():
+                    for b in lane:
+                        columns['packet_time'].append(t)
+                        columns['packet_next'].append(hop)
+                        columns['packet_ttl'].append(b.ttl)
+                        columns['packet_source'].append(b.source)
+                        columns['packet_destination'].append(b.final_destination)
+                        columns['packet_sources'].append(cls.chain_index(b.source_list, chains, columns))
+                        flood = b.flood_id
+                        columns['packet_flood_source'].append(-1 if flood is None else flood[0])
+                        columns['packet_flood_sequence'].append(0 if flood is None else flood[1])
+                        columns['packet_arrival'].append(b.arrival)
+            if node.seen is None:
+                columns['node_seen'].append(-1)
+                columns['node_seen_capacity'].append(0)
+                columns['node_seen_age'].append(-1)
+            else:
+                columns['node_seen'].append(len(node.seen.entries))
+                columns['node_seen_capacity'].append(node.seen.capacity)
+                columns['node_seen_age'].append(-1 if node.seen.max_age is None else node.seen.max_age)
+                for key, t in node.seen.entries.items():
+                    columns['seen_source'].append(-1 if key is None else key[0])
+                    columns['seen_sequence'].append(0 if key is None else key[1])
+                    columns['seen_time'].append(t)
+        return cls(meta, columns)
+
+    @staticmethod
+    def chain_index(entry, chains, columns):    # Returns the index of a source list in the chain table, -1 if empty
+        missing = []                            # The entries not in the table yet, the last entry first
+        while entry.parent is not None and id(entry) not in chains:
+            missing.append(entry)
+            entry = entry.parent
+        parent = -1 if entry.parent is None else chains[id(entry)]
+        for entry in reversed(missing):         # A parent always comes before its children in the table
+            columns['chain_node'].append(entry.node)
+            columns['chain_parent'].append(parent)
+            parent = chains[id(entry)] = len(columns['chain_node']) - 1
+        return parent
+
+    def to_bytes(self):                 # Returns the snapshot as the contents of a snapshot file
+        import json
+        layout = []                     # (name, byte offset from the end of the header, number of values)
+        offset = 0
+        for name in self.COLUMNS:
+            layout.append((name, offset, len(self.columns[name])))
+            offset += -(-len(self.columns[name]) * array(self.COLUMNS[name]).itemsize // 8) * 8
+        meta = dict(self.meta, columns=layout)
+        header = json.dumps(meta).encode()
+        header += b' ' * (-(len(self.MAGIC) + 8 + len(header)) % 8)    # Keeps the columns 8 byte aligned
+        parts = [self.MAGIC, struct.pack('<Q', len(header)), header]
+        for name in self.COLUMNS:
+            data = bytes(memoryview(self.columns[name]).cast('B'))
+            parts.append(data)
+            parts.append(bytes(-len(data) % 8))
+        return b''.join(parts)
+
+    def save(self, path):               # Writes the snapshot file
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):                # Maps a snapshot file into memory, the columns are read from the mapping
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(buffer)
+
+    @classmethod
+    def from_buffer(cls, buffer):       # Reads a snapshot from the contents of a snapshot file without copying them
+        import json
+        view = memoryview(buffer)
+        if bytes(view[:len(cls.MAGIC)]) != cls.MAGIC:
+            raise ValueError('Not a flooding network snapshot')
+        start = len(cls.MAGIC) + 8
+        size = struct.unpack('<Q', view[len(cls.MAGIC):start])[0]
+        meta = json.loads(bytes(view[start:start + size]))
+        if meta['byteorder'] != sys.byteorder:
+            raise ValueError('The snapshot was taken on a machine of the other byte order')
+        start += size
+        columns = {}
+        for name, offset, length in meta.pop('columns'):
+            code = cls.COLUMNS[name]
+            end = start + offset + length * array(code).itemsize
+            columns[name] = view[start + offset:end].cast(code)
+        return cls(meta, columns, buffer)
+
+    def close(self):                    # Releases the mapping of a loaded snapshot
+        if self.buffer is not None:
+            for column in self.columns.values():
+                column.release()
+            self.columns = {}
+            if isinstance(self.buffer, mmap.mmap):
+                self.buffer.close()
+            self.buffer = None
+
+    def get_topology(self):             # Returns the Topology of the snapshot, made once and shared by the restores
+        if self.topology is None:
+            topology = Topology.__new__(Topology)   # The adjacency arrays are taken as they are, not built again
+            topology.node_count = self.meta['node_count']
+            for name in ('link_source', 'link_target', 'offsets', 'adjacent', 'adjacent_link'):
+                setattr(topology, name, array(self.COLUMNS[name], self.columns[name].tobytes()))
+            self.topology = topology
+        return self.topology
+
+    def get_chains(self):               # Returns the SourceList of every chain entry, made once and shared by restores
+        if self.chains is None:
+            empty = SourceList()
+            chains = []
+            for node, parent in zip(self.columns['chain_node'], self.columns['chain_parent']):
+                chains.append(SourceList(node, empty if parent < 0 else chains[parent]))
+            chains.append(empty)        # Index -1 is the empty list
+            self.chains = chains
+        return self.chains
+
+    def restore(self, network=Network):     # Returns a new network in the state the snapshot was taken in
+        meta = self.meta
+        columns = self.columns
+        if meta['links'] == 'topology':
+            net = network(0, 0)
+            net.set_topology(self.get_topology())
+            table = net.links
+            table.status[:] = columns['link_status'].tobytes()
+            table.packets_received = array('q', columns['link_received'].tobytes())
+            if meta['capacity']:
+                table.capacity = array('i', columns['link_capacity'].tobytes())
+                table.load = array('i', columns['link_load'].tobytes())
+        else:
+            net = network(meta['node_count'], meta['link_count'])
+            links = []
+            for c in range(meta['link_count']):
+                link = Link()
+                link.link_id = c
+                if columns['link_source'][c] >= 0:
+                    link.linked_between = [columns['link_source'][c], columns['link_target'][c]]
+                link.status = columns['link_status'][c] == 1
+                link.load = columns['link_load'][c]
+                link.capacity = columns['link_capacity'][c]
+                link.packets_received = columns['link_received'][c]
+                links.append(link)
+            net.links = links
+            offsets = columns['offsets']
+            adjacent = columns['adjacent']
+            adjacent_link = columns['adjacent_link']
+            for a in range(meta['node_count']):
+                net.neighbors[a] = list(zip(adjacent[offsets[a]:offsets[a + 1]],
+                                            adjacent_link[offsets[a]:offsets[a + 1]]))
+                for neighbor, link in net.neighbors[a]:     # The lowest of parallel links, like index_pair
+                    if link < net.link_index.get((a, neighbor), link + 1):
+                        net.link_index[(a, neighbor)] = link
+        for name in ('internal_timer', 'total_packets', 'transmissions', 'drops', 'seen_capacity', 'seen_age',
+                     'wide_links', 'queue_limit', 'drop_policy'):
+            setattr(net, name, meta[name])
+        net.used_links = list(columns['used_links'])
+        net.sequences = dict(zip(columns['sequence_node'], columns['sequence_next']))
+
+        chains = self.get_chains()
+        offsets = columns['offsets']
+        adjacent_link = columns['adjacent_link']
+        seen_source = columns['seen_source']
+        seen_sequence = columns['seen_sequence']
+        seen_time = columns['seen_time']
+        s = 0                           # Index of the first seen cache entry of the node being restored
+        packets = zip(columns['packet_time'], columns['packet_next'], columns['packet_ttl'], columns['packet_source'],
+                      columns['packet_destination'], columns['packet_sources'], columns['packet_flood_source'],
+                      columns['packet_flood_sequence'], columns['packet_arrival'])
+        for a, received, count, seen, capacity, age, arrivals in zip(columns['node_id'], columns['node_received'],
+                                                                    columns['node_packets'], columns['node_seen'],
+                                                                    columns['node_seen_capacity'],
+                                                                    columns['node_seen_age'], columns['node_arrivals']):
+            node = Node()
+            node.set_node_id(a)
+            node.node_links = list(adjacent_link[offsets[a]:offsets[a + 1]])
+            node.packets_received = received
+            queue = node.nodeQueue
+            for _ in range(count):
+                t, hop, ttl, source, destination, sources, flood_source, flood_sequence, arrival = next(packets)
+                b = Packet.__new__(Packet)
+                b.ttl = ttl
+                b.source = source
+                b.source_list = chains[sources]
+                b.final_destination = destination
+                b.next_destination = hop
+                b.exec_time = t
+                b.flood_id = None if flood_source < 0 else (flood_source, flood_sequence)
+                queue.append(b)
+                b.arrival = arrival
+            queue.arrivals = arrivals
+            if seen >= 0:
+                node.seen = SeenCache(capacity, None if age < 0 else age)
+                entries = node.seen.entries
+                for source, sequence, t in zip(seen_source[s:s + seen], seen_sequence[s:s + seen],
+                                               seen_time[s:s + seen]):
+                    entries[None if source < 0 else (source, sequence)] = t
+                s += seen
+            net.nodes[a] = node
+        return net
+
+
+# The built-in topology, link x connects the two nodes of entry x
+TOPOLOGY = [(0, 1), (0, 4), (0, 2), (1, 3), (1, 4), (2, 4), (2, 5), (3, 4), (4, 5), (3, 6), (4, 6),
+            (4, 8), (4, 7), (5, 7), (6, 9), (6, 8), (7, 8), (7, 10), (8, 11), (9, 12), (9, 11),
+            (10, 11), (10, 13), (11, 12), (11, 14), (11, 13), (12, 14), (13, 14)]
+
+TOPOLOGIES = {'builtin': TOPOLOGY}      # Topologies a sweep can refer to by name
+
+
+def grid_topology(rows, cols):          # Nodes on a rows x cols lattice linked to the nodes right and below them
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            if c + 1 < cols:
+                edges.append((r * cols + c, r * cols + c + 1))
+            if r + 1 < rows:
+                edges.append((r * cols + c, (r + 1) * cols + c))
+    return Topology.from_edges(edges, rows * cols)
+
+
+def geometric_topology(n, radius, seed=0):      # Random points in the unit square linked when closer than radius
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(n)]
+    cells = {}                          # Points bucketed on a grid of radius sized cells
+    for a, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(a)
+    edges = []
+    for a, (x, y) in enumerate(points):
+        cx, cy = int(x / radius), int(y / radius)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for b in cells.get((cx + dx, cy + dy), ()):
+                    if b > a and (points[b][0] - x) ** 2 + (points[b][1] - y) ** 2 <= radius * radius:
+                        edges.append((a, b))
+    edges.sort()
+    return Topology.from_edges(edges, n)
+
+
+def erdos_renyi_topology(n, p, seed=0):     # Every pair of nodes linked with probability p
+    rng = random.Random(seed)
+    edges = []
+    if p >= 1:
+        edges = [(a, b) for b in range(n) for a in range(b)]
+    elif p > 0:                         # Skips over the pairs which are not linked, Batagelj and Brandes
+        log_q = math.log(1 - p)
+        v, w = 1, -1
+        while v < n:
+            w += 1 + int(math.log(1 - rng.random()) / log_q)
+            while w >= v and v < n:
+                w -= v
+                v += 1
+            if v < n:
+                edges.append((w, v))
+    return Topology.from_edges(edges, n)
+
+
+def scale_free_topology(n, m, seed=0):      # Preferential attachment, every new node links to m existing nodes
+    rng = random.Random(seed)
+    edges = []
+    targets = list(range(m))
+    repeated = []                       # Every node once per link it has, picking from it favours the hubs
+    for a in range(m, n):
+        for b in targets:
+            edges.append((b, a))
+        repeated.extend(targets)
+        repeated.extend([a] * m)
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(rng.choice(repeated))
+        targets = sorted(chosen)
+    return Topology.from_edges(edges, n)
+
+
+@functools.lru_cache(maxsize=8)
+def load_topology(spec):                # Builds the topology named by a command line specification
+    """ builtin, file:PATH, adjlist:PATH, grid:ROWSxCOLS, geometric:N:RADIUS[:SEED], erdos-renyi:N:P[:SEED] or
+        scale-free:N:M[:SEED]"""
+    kind, _, args = spec.partition(':')
+    if kind in TOPOLOGIES and not args:
+        return Topology.from_edges(TOPOLOGIES[kind])
+    if kind == 'file':
+        return Topology.load(args)
+    if kind == 'adjlist':
+        return Topology.load(args, 'adjlist')
+    fields = args.split(':')
+    if kind == 'grid':
+        rows, cols = args.split('x')
+        return grid_topology(int(rows), int(cols))
+    if kind == 'geometric':
+        return geometric_topology(int(fields[0]), float(fields[1]), int(fields[2]) if len(fields) > 2 else 0)
+    if kind == 'erdos-renyi':
+        return erdos_renyi_topology(int(fields[0]), float(fields[1]), int(fields[2]) if len(fields) > 2 else 0)
+    if kind == 'scale-free':
+        return scale_free_topology(int(fields[0]), int(fields[1]), int(fields[2]) if len(fields) > 2 else 0)
+    raise ValueError('Unknown topology: ' + spec)
+
+
+class Scenario:
+    """ One run of a sweep, the topology name, source and destination node, the packet ttl, the forwarding mode and the
+        number of iterations"""
+    def __init__(self, topology, source, destination, ttl, mode, ticks=12):
+        self.topology = topology
+        self.source = source
+        self.destination = destination
+        self.ttl = ttl
+        self.mode = mode
+        self.ticks = ticks
+
+    def get_fields(self):               # Returns the scenario as a row of the sweep results
+        return [self.topology, self.source, self.destination, 'auto' if self.ttl is None else self.ttl, self.mode,
+                self.ticks]
+
+
+class Result:
+    """ Outcome of a flood simulated by run(), the scenario, the first iteration a packet reached the destination (None
+        if none did), the packets sent over links, the largest queue of a single node and per iteration the packets in
+        the network and the packets received at the destination, followed by the final counters of every node"""
+    def __init__(self, source, destination, ttl, mode, ticks):
+        self.source = source
+        self.destination = destination
+        self.ttl = ttl
+        self.mode = mode
+        self.ticks = ticks
+        self.delivery_tick = None       # First iteration in which a packet reached the destination
+        self.transmissions = 0          # Packets sent over a link during the run
+        self.peak_queue = 0             # Largest queue of a single node over the run
+        self.in_network = []            # Packets queued in the network after every iteration
+        self.delivered = []             # Packets received at the destination after every iteration
+        self.queue_sizes = []           # Queue size of every node after the last iteration
+        self.received_counts = []       # Packets received at every node after the last iteration
+
+    def record(self, net, tick):        # Adds the state of network net after iteration tick
+        sizes = [node.queue_size() for n, node in net.nodes.get_created()]
+        self.in_network.append(sum(sizes))
+        self.peak_queue = max([self.peak_queue] + sizes)
+        received = net.nodes[self.destination].packets_received
+        self.delivered.append(received)
+        if self.delivery_tick is None and received > 0:
+            self.delivery_tick = tick
+
+    def finish(self, net):              # Takes the final counters of network net
+        self.transmissions = net.transmissions
+        self.queue_sizes = net.queue_sizes()
+        self.received_counts = net.received_counts()
+
+    def get_packets_received(self):     # Returns the packets received at the destination by the end of the run
+        return self.delivered[-1] if self.delivered else 0
+
+    def as_dict(self):                  # Returns the result as plain data, ready for json
+        return dict(vars(self))
+
+
+def build_network(topology=None, network=Network):     # Creates a network on a Topology, a list of (node, node) links
+    if topology is None:                                # or a load_topology specification
+        topology = TOPOLOGY
+    if isinstance(topology, str):
+        topology = load_topology(topology)
+    if not isinstance(topology, Topology):
+        topology = Topology.from_edges(topology)
+    net = network(0, 0)
+    net.set_topology(topology)
+    return net
+
+
+def start_flood(net, source, destination, ttl, mode):  # Attaches a scheduler and puts the packet in the source node
+    scheduler = Scheduler(net, mode)
+    return scheduler, inject(net, source, destination, ttl, mode)
+
+
+def inject(net, source, destination, ttl, mode):    # Puts a packet in the source node and returns its ttl, a ttl of
+    packet = Packet()                               # None is the smallest ttl reaching the destination
+    packet.ttl = net.minimal_ttl(source, destination) if ttl is None else ttl
+    packet.set_destination(destination)
+    if mode == 'pruned':
+        net.init_pruned(source, packet)
+    elif mode == 'seen':
+        net.init_seen(source, packet)
+    else:
+        net.init_network(source, packet)
+    return packet.ttl
+
+
+def run(topology, source, destination, ttl=None, mode='problem', ticks=12, instruments=None):   # Simulates a flood
+    net = build_network(topology)                                                               # and returns its Result
+    net.instruments = instruments
+    scheduler, ttl = start_flood(net, source, destination, ttl, mode)
+    result = Result(source, destination, ttl, mode, ticks)
+    for tick in range(ticks):
+        scheduler.run_tick(tick)
+        result.record(net, tick)
+    result.finish(net)
+    return result
+
+
+def run_scenario(scenario):             # Runs one scenario in its own network and returns its row of the sweep results
+    result = run(scenario.topology, scenario.source, scenario.destination, scenario.ttl, scenario.mode, scenario.ticks)
+    delivery_tick = '' if result.delivery_tick is None else result.delivery_tick
+    received = ' '.join(str(count) for count in result.received_counts)
+    return scenario.get_fields() + ['ok', delivery_tick, result.transmissions, result.peak_queue, received]
+
+
+SWEEP_COLUMNS = ['topology', 'source', 'destination', 'ttl', 'mode', 'ticks', 'status', 'delivery_tick',
+                 'transmissions', 'peak_queue', 'packets_received']
+
+
+def sweep(scenarios, output, workers=None):     # Runs the scenarios on a process pool and streams the rows to a CSV file
+    import csv
+    from concurrent.futures import ProcessPoolExecutor, wait
+    scenarios = list(scenarios)
+    workers = workers or os.cpu_count() or 1
+    pending = deque(range(len(scenarios)))      # Indexes of the scenarios still to run
+    suspects = deque()                          # Indexes of the scenarios in flight when a worker process died
+    breaks = Counter()                          # Pools broken while a scenario was in flight
+    with open(output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SWEEP_COLUMNS)
+        while pending or suspects:      # Every broken pool is replaced by a fresh pool of the full size
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                broken = sweep_pool(pool, scenarios, pending, suspects, 2 * workers, writer, f)
+            for i in broken:
+                breaks[i] += 1
+                if breaks[i] < 2:
+                    suspects.append(i)
+                    continue
+                with ProcessPoolExecutor(max_workers=1) as pool:    # Broke a pool twice, runs alone so a crash
+                    future = pool.submit(run_scenario, scenarios[i])  # only loses its own row
+                    wait([future])
+                    write_result(writer, f, scenarios[i], future, isolated=True)
+    return len(scenarios)
+
+
+def sweep_pool(pool, scenarios, pending, suspects, window, writer, f):  # Runs scenarios with at most window in flight,
+    from concurrent.futures import FIRST_COMPLETED, wait                # returns those in flight if a worker died
+    futures = {}
+    broken = []
+    suspect = None                      # A single suspect is in flight at a time, so a second break points at it
+    while True:
+        while not broken and len(futures) < window:
+            if suspects and suspect is None:
+                i = suspect = suspects.popleft()
+            elif pending:
+                i = pending.popleft()
+            else:
+                break
+            futures[pool.submit(run_scenario, scenarios[i])] = i
+        if not futures:
+            return broken
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            i = futures.pop(future)
+            if i == suspect:
+                suspect = None
+            if not write_result(writer, f, scenarios[i], future):
+                broken.append(i)
+
+
+def write_result(writer, f, scenario, future, isolated=False):     # Writes the row of a finished scenario, returns
+    from concurrent.futures.process import BrokenProcessPool            # False when its worker died in a shared pool
+    try:
+        row = future.result()
+    except BrokenProcessPool as e:
+        if not isolated:
+            return False
+        row = scenario.get_fields() + ['error: worker process died ' + str(e), '', '', '', '']
+    except Exception as e:
+        row = scenario.get_fields() + ['error: ' + type(e).__name__ + ': ' + str(e), '', '', '', '']
+    writer.writerow(row)
+    f.flush()
+    return True
+
+
+def simulate(topology, source, destination, ttl, mode, ticks, sink=None, instruments=None):   # Runs a flood and returns
+    net = build_network(topology)                                                              # the state of every iteration
+    net.instruments = instruments
+    scheduler, ttl = start_flood(net, source, destination, ttl, mode)
+    states = []                         # (queue sizes, packets received) of every node after every iteration
+    for run in range(ticks):
+        scheduler.run_tick(run)
+        states.append((net.queue_sizes(), net.received_counts()))
+        if sink is not None:
+            sink.record(net, run)
+    return states
+
+
+def partition_worker(conn, topology, owner, partition, mode):     # Runs one partition, driven by run_partitioned
+    net = build_network(topology, PartitionNetwork)
+    net.set_partition(owner, partition)
+    scheduler = Scheduler(net, mode)
+    while True:
+        message = conn.recv()
+        if message[0] == 'init':        # Places the packet at the source and reports the lanes due first
+            source, ttl, destination = message[1:]
+            if owner[source] == partition:
+                packet = Packet()
+                packet.ttl = ttl
+                packet.set_destination(destination)
+                net.init_network(source, packet)
+            conn.send(net.due_lanes(0))
+        elif message[0] == 'send':      # Sends the packets due in the iteration, keeps the local receptions back
+            t, remote_lanes = message[1:]
+            net.internal_timer = t
+            net.reserve_links(remote_lanes, t)
+            scheduler.run_tick(t)
+            outgoing = {}
+            local = []
+            for record in net.received:
+                if owner[record[1]] == partition:
+                    local.append(record)
+                else:
+                    outgoing.setdefault(owner[record[1]], []).append(record)
+            net.received = local
+            conn.send(outgoing)
+        elif message[0] == 'receive':   # Receives the packets of the iteration and reports the lanes due next
+            t, incoming = message[1:]
+            received, net.received = net.received + incoming, []
+            net.deliver(received, mode)
+            rows = [(a, node.queue_size(), node.packets_received) for a, node in net.nodes.get_created()
+                    if owner[a] == partition and (node.queue_size() or node.packets_received)]
+            conn.send((net.due_lanes(t + 1), rows))     # Only the nodes holding or having received packets
+        else:
+            conn.close()
+            return
+
+
+def run_partitioned(topology, source, destination, ttl, mode, ticks, workers):     # Runs a flood on worker processes
+    import multiprocessing
+    if mode not in ('problem', 'solution'):
+        raise ValueError('Partitioned runs support the problem and the solution mode, not ' + str(mode))
+    net = build_network(topology)
+    node_count = len(net.nodes)
+    owner = [a * workers // node_count for a in range(node_count)]     # Contiguous ranges of node ids
+    conns = []
+    processes = []
+    for p in range(workers):
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=partition_worker, args=(child, topology, owner, p, mode))
+        process.start()
+        conns.append(parent)
+        processes.append(process)
+
+    try:
+        for conn in conns:
+            conn.send(('init', source, ttl, destination))
+        lanes = route([conn.recv() for conn in conns], owner, workers)
+        states = []
+        for run in range(ticks):
+            for p in range(workers):
+                conns[p].send(('send', run, lanes[p]))
+            incoming = [[] for _ in range(workers)]
+            for conn in conns:
+                for p, records in conn.recv().items():
+                    incoming[p].extend(records)
+            for p in range(workers):
+                conns[p].send(('receive', run, incoming[p]))
+            sizes = [0] * node_count
+            received = [0] * node_count
+            due = []
+            for p in range(workers):
+                p_lanes, rows = conns[p].recv()
+                due.append(p_lanes)
+                for a, size, count in rows:     # The nodes left out hold and received nothing
+                    sizes[a] = size
+                    received[a] = count
+            lanes = route(due, owner, workers)
+            states.append((sizes, received))
+    finally:
+        for conn in conns:
+            conn.send(('stop',))
+        for process in processes:
+            process.join()
+    return states
+
+
+def route(due, owner, workers):         # Hands every due boundary lane to the partition at the other end of the link
+    lanes = [[] for _ in range(workers)]
+    for p_lanes in due:
+        for a, neighbor in p_lanes:
+            lanes[owner[neighbor]].append((a, neighbor))
+    return lanes
+
+
+def speedup_report(topology, source, destination, ttl, mode, ticks, worker_counts=(1, 2, 4, 8)):
+    start = time.perf_counter()
+    expected = simulate(topology, source, destination, ttl, mode, ticks)
+    single = time.perf_counter() - start
+    print('Workers   Seconds   Speedup   Identical')
+    print('{:>7} {:>9.3f} {:>9.2f}   {}'.format('single', single, 1.0, 'yes'))
+    for workers in worker_counts:
+        start = time.perf_counter()
+        states = run_partitioned(topology, source, destination, ttl, mode, ticks, workers)
+        seconds = time.perf_counter() - start
+        print('{:>7} {:>9.3f} {:>9.2f}   {}'.format(workers, seconds, single / seconds,
+                                                    'yes' if states == expected else 'NO'))
+
+
+def emulate(topology, source, destination, ttl, mode, ticks, delay=1, bandwidth=None, transport=None, sink=None):
+    import asyncio              # Emulates a flood with the nodes as asyncio tasks, returns the state of every iteration
+    net = build_network(topology)
+    emulator = Emulator(net, mode, delay, bandwidth, transport)
+    inject(net, source, destination, ttl, mode)
+    states = []                         # (queue sizes, packets received) of every node after every iteration
+    asyncio.run(run_emulator(emulator, ticks, lambda run: states.append((net.queue_sizes(), net.received_counts())),
+                             sink))
+    return states
+
+
+async def run_emulator(emulator, ticks, observe=None, sink=None):   # Opens the emulator, runs iterations 0 - ticks - 1
+    await emulator.open()                                           # and closes it, observe(run) is called after each
+    try:
+        for run in range(ticks):
+            await emulator.run_tick(run)
+            if observe is not None:
+                observe(run)
+            if sink is not None:
+                sink.record(emulator.net, run)
+    finally:
+        await emulator.close()
+
+
+def emulation_report(topology, source, destination, ttl, mode, ticks, delay=1, bandwidth=None, udp=False, check=False):
+    import asyncio
+    net = build_network(topology)
+    transport = UdpTransport() if udp else None
+    emulator = Emulator(net, mode, delay, bandwidth, transport)
+    ttl = inject(net, source, destination, ttl, mode)
+    rows = []                           # (packets in the network, packets received, node tasks) after every iteration
+    states = []
+    target = net.nodes[destination]
+
+    def observe(run):
+        rows.append((sum(net.queue_sizes()), target.packets_received, len(emulator.tasks)))
+        if check:
+            states.append((net.queue_sizes(), net.received_counts()))
+
+    start = time.perf_counter()
+    asyncio.run(run_emulator(emulator, ticks, observe))
+    seconds = time.perf_counter() - start
+    print('Iteration   In network   Received   Tasks')
+    for run, (in_network, received, tasks) in enumerate(rows):
+        print('{:>9} {:>12} {:>10} {:>7}'.format(run, in_network, received, tasks))
+    print('Nodes: {}  ttl: {}  delay: {}  transmissions: {}  peak tasks: {}  seconds: {:.3f}'.format(
+        len(net.nodes), ttl, delay, net.transmissions, emulator.peak_tasks, seconds))
+    if udp:
+        print('Datagrams: {}  bytes: {}'.format(transport.datagrams_sent, transport.bytes_sent))
+    if check:                           # The Scheduler on the same network, only equal for a delay of one iteration
+        reference = build_network(topology)
+        if bandwidth is not None:
+            reference.set_link_capacity(bandwidth)
+        scheduler, ttl = start_flood(reference, source, destination, ttl, mode)
+        identical = True
+        for run in range(ticks):
+            scheduler.run_tick(run)
+            identical = identical and states[run] == (reference.queue_sizes(), reference.received_counts())
+        print('Identical to the Scheduler: ' + ('yes' if identical else 'NO'))
+
+
+@functools.lru_cache(maxsize=8)
+def open_snapshot(path):                # Maps a snapshot file once per process, the branches run there share it
+    return Snapshot.load(path)
+
+
+def run_branch(snapshot, mode, links, destination, ticks):     # Restores a snapshot, fails the links and runs the
+    net = snapshot.restore()                                    # iterations after the snapshot up to ticks - 1
+    if links:
+        net.fail_links(links)
+    scheduler = Scheduler(net, mode)
+    result = Result(None, destination, None, mode, ticks)
+    for tick in range(net.internal_timer + 1, ticks):
+        scheduler.run_tick(tick)
+        result.record(net, tick)
+    result.finish(net)
+    return result
+
+
+def branch_worker(path, mode, links, destination, ticks):      # Runs one branch of the snapshot file at path
+    return run_branch(open_snapshot(path), mode, links, destination, ticks)
+
+
+def what_if(path, branches, destination, ticks, workers=1):    # Runs every (mode, failed links) branch forked from
+    if workers == 1:                                            # the snapshot file at path and returns their Results
+        return [branch_worker(path, mode, links, destination, ticks) for mode, links in branches]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:     # Every worker maps the file, the pages are shared
+        futures = [pool.submit(branch_worker, path, mode, links, destination, ticks) for mode, links in branches]
+        return [future.result() for future in futures]
+
+
+def what_if_report(topology, source, destination, ttl, mode, at, ticks, branches, path, workers=1):
+    net = build_network(topology)
+    start = time.perf_counter()
+    scheduler, ttl = start_flood(net, source, destination, ttl, mode)
+    scheduler.run(at + 1)
+    replay = time.perf_counter() - start
+    start = time.perf_counter()
+    Snapshot.take(net).save(path)
+    taken = time.perf_counter() - start
+    start = time.perf_counter()
+    snapshot = Snapshot.load(path)
+    snapshot.restore()
+    restored = time.perf_counter() - start
+    snapshot.close()
+    print('Snapshot of iteration {} in the {} mode with ttl {}: {} packets queued, {} bytes written to {}'.format(
+        at, mode, ttl, sum(net.queue_sizes()), os.path.getsize(path), path))
+    print('Replay: {:.4f}s  take and save: {:.4f}s  load and restore: {:.4f}s'.format(replay, taken, restored))
+    results = what_if(path, branches, destination, ticks, workers)
+    print('Branch                 Delivered   First delivery   Transmissions   In network')
+    for (branch_mode, links), result in zip(branches, results):
+        name = branch_mode + (':' + ','.join(str(c) for c in links) if links else '')
+        print('{:<20} {:>11} {:>16} {:>15} {:>12}'.format(
+            name, result.get_packets_received(), '-' if result.delivery_tick is None else result.delivery_tick,
+            result.transmissions, result.in_network[-1] if result.in_network else 0))
+
+
+def flood(topology, floods, ttl, mode, ticks, capacity=1024, max_age=None, instruments=None):   # Runs concurrent
+    net = build_network(topology)                                                   # floods, returns the network
+    net.seen_capacity = capacity
+    net.seen_age = max_age
+    net.instruments = instruments
+    scheduler = Scheduler(net, mode)
+    for source, destination in floods:
+        inject(net, source, destination, ttl, mode)
+    scheduler.run(ticks)
+    return net
+
+
+def dedup_report(topology, floods, ttl, ticks, capacity=1024, max_age=None):   # Compares the source list of the
+    import tracemalloc                                                          # solution with the seen caches
+    print('Mode      Transmissions   Delivered   Reached   Peak KiB   Seen ids   Seconds')
+    for mode in ('solution', 'seen'):
+        start = time.perf_counter()
+        net = flood(topology, floods, ttl, mode, ticks, capacity, max_age)
+        seconds = time.perf_counter() - start
+        seen = sum(len(node.seen) for n, node in net.nodes.get_created() if node.seen is not None)
+        tracemalloc.start()             # Peak of the packets, source lists and caches allocated during the run
+        flood(topology, floods, ttl, mode, ticks, capacity, max_age)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        instruments = Instruments()     # Counts the deliveries, the solution counts every reception as received
+        flood(topology, floods, ttl, mode, ticks, capacity, max_age, instruments)
+        delivered = sum(instruments.by_node['delivery'].values())
+        reached = len({destination for source, destination in floods if instruments.by_node['delivery'][destination]})
+        print('{:<9} {:>13} {:>11} {:>9} {:>10.1f} {:>10} {:>9.3f}'.format(
+            mode, net.transmissions, delivered, '{}/{}'.format(reached, len({d for s, d in floods})), peak / 1024,
+            seen, seconds))
+
+
+def random_floods(topology, count, seed=0):     # Picks count random (source, destination) pairs of different nodes
+    rng = random.Random(seed)
+    node_count = len(build_network(topology).nodes)
+    return [tuple(rng.sample(range(node_count), 2)) for _ in range(count)]
+
+
+class Flow:
+    """ A stream of packets from a source to a destination node, every iteration the arrival process gives the number
+        of new packets. constant sends rate packets per iteration, poisson draws them with a mean of rate and bursty
+        sends bursts of burst packets arriving as a poisson process, rate packets per iteration on average. The flow
+        also holds its counters, filled in by the Workload, the lost and in flight packets whenever it reports"""
+    PROCESSES = ('constant', 'poisson', 'bursty')
+
+    def __init__(self, source, destination, rate=1.0, process='constant', burst=8, ttl=None, start=0, stop=None):
+        if process not in self.PROCESSES:
+            raise ValueError('Unknown arrival process: ' + str(process))
+        self.source = source
+        self.destination = destination
+        self.rate = rate                # Mean packets per iteration
+        self.process = process          # One of PROCESSES
+        self.burst = burst              # Packets in a burst of the bursty process
+        self.ttl = ttl                  # Ttl of the packets, None for the hop distance to the destination
+        self.start = start              # First iteration the flow sends in
+        self.stop = stop                # Iteration the flow stops sending at, None to send until the end
+        self.credit = 0.0               # Packets owed by the constant process
+        self.next_arrival = None        # Time of the next arrival of the poisson and bursty processes
+        self.injected = 0               # Packets put in the source node
+        self.delivered = 0              # Packets of which a copy reached the destination
+        self.duplicates = 0             # Further copies of delivered packets reaching the destination
+        self.dropped = 0                # Copies dropped from full queues
+        self.lost = 0                   # Packets none of whose copies was delivered or is left in the network
+        self.in_flight = 0              # Packets not delivered yet of which copies are left in the network
+        self.latencies = Counter()      # Iterations from injection to the first copy delivered: number of packets
+
+    def arrivals(self, t, rng):         # Returns the number of packets arriving at iteration t
+        if t < self.start or (self.stop is not None and t >= self.stop):
+            return 0
+        if self.process == 'constant':
+            self.credit += self.rate
+            count = int(self.credit)
+            self.credit -= count
+            return count
+        events = self.rate if self.process == 'poisson' else self.rate / self.burst    # Arrivals per iteration
+        if self.next_arrival is None:
+            self.next_arrival = t + rng.expovariate(events)
+        count = 0
+        while self.next_arrival < t + 1:
+            count += 1
+            self.next_arrival += rng.expovariate(events)
+        return count if self.process == 'poisson' else count * self.burst
+
+    def get_loss(self):                 # Returns the share of the packets whose copies all ended without a delivery
+        return self.lost / self.injected if self.injected else 0.0
+
+    def get_latency(self, q):           # Returns the latency quantile q of the delivered packets, None if none was
+        rank = q * (self.delivered - 1)
+        for latency in sorted(self.latencies):
+            rank -= self.latencies[latency]
+            if rank < 0:
+                return latency
+        return None
+
+    def get_mean_latency(self):
+        if not self.delivered:
+            return None
+        return sum(latency * count for latency, count in self.latencies.items()) / self.delivered
+
+
+class Workload:
+    """ Many concurrent flows over one network. Every packet of a flow is a flood with its own id, the workload keeps
+        the flow and the injection iteration of every packet so it can measure the latency of the first copy reaching
+        the destination, the packets lost and the throughput of every flow. The network reports every copy it queues
+        and every copy it receives or drops, so the workload knows the copies of every packet left in the network. A
+        packet is lost once none is left and none was delivered, until then it is in flight. It runs on a Network in
+        any mode or on an AggregateNetwork in the problem mode"""
+    def __init__(self, flows, seed=0):
+        self.flows = list(flows)
+        self.rng = random.Random(seed)  # Draws the arrivals of the poisson and bursty flows
+        self.flow_of = array('i')       # Flow of every packet
+        self.injected_at = array('i')   # Iteration every packet was injected at
+        self.delivered = bytearray()    # 1 for every packet of which a copy reached the destination
+        self.alive = array('i')         # Copies of every packet queued in the network
+        self.ids = {}                   # Flood id of the packets on a Network: packet
+        self.ticks = 0                  # Iterations run
+        self.seconds = 0.0              # Wall time of the run
+        self.transmissions = 0          # Packets sent over links during the run
+
+    def inject(self, net, t, mode):     # Puts the packets of every flow arriving at iteration t in their source nodes
+        net.internal_timer = t - 1      # The packets are due in the next iteration, t
+        for f, flow in enumerate(self.flows):
+            for _ in range(flow.arrivals(t, self.rng)):
+                ttl = net.minimal_ttl(flow.source, flow.destination) if flow.ttl is None else flow.ttl
+                tag = len(self.flow_of)
+                self.flow_of.append(f)
+                self.injected_at.append(t)
+                self.delivered.append(0)
+                self.alive.append(0)
+                flow.injected += 1
+                if isinstance(net, AggregateNetwork):
+                    net.inject(flow.source, ttl, flow.destination, tag)
+                    continue
+                packet = Packet()
+                packet.ttl = ttl
+                packet.set_destination(flow.destination)
+                packet.flood_id = net.new_flood_id(flow.source)
+                self.ids[packet.flood_id] = tag
+                if mode == 'pruned':
+                    net.init_pruned(flow.source, packet)
+                elif mode == 'seen':
+                    net.init_seen(flow.source, packet)
+                else:
+                    net.init_network(flow.source, packet)
+
+    def deliver(self, b, t):            # Counts a copy of packet b reaching its destination at iteration t
+        tag = self.ids.get(b.flood_id)
+        if tag is not None:
+            self.deliver_packet(tag, t)
+
+    def deliver_packet(self, tag, t):   # Counts a copy of packet tag reaching its destination at iteration t
+        flow = self.flows[self.flow_of[tag]]
+        if self.delivered[tag]:
+            flow.duplicates += 1
+            return
+        self.delivered[tag] = 1
+        flow.delivered += 1
+        flow.latencies[t - self.injected_at[tag] + 1] += 1  # A packet crossing one link in its first iteration takes 1
+
+    def deliver_many(self, tags, t):    # Counts the copies of the packets in the numpy array tags delivered at t
+        if len(tags) == 0:
+            return
+        unique, first = np.unique(tags, return_index=True)
+        for tag in unique.tolist():
+            self.deliver_packet(tag, t)
+        for flow, count in zip(self.flows, self.per_flow(np.delete(tags, first))):
+            flow.duplicates += count
+
+    def drop(self, b):                  # Counts a copy of packet b dropped from a full queue
+        tag = self.ids.get(b.flood_id)
+        if tag is not None:
+            self.flows[self.flow_of[tag]].dropped += 1
+            self.alive[tag] -= 1
+
+    def drop_many(self, tags):          # Counts the dropped copies of the packets in the numpy array tags, which the
+        for flow, count in zip(self.flows, self.per_flow(tags)):    # AggregateNetwork never queued
+            flow.dropped += count
+
+    def copy(self, b):                  # Counts a copy of packet b made by a node
+        tag = self.ids.get(b.flood_id)
+        if tag is not None:
+            self.alive[tag] += 1
+
+    def receive(self, b):               # Counts a copy of packet b taken off the network by the node receiving it
+        tag = self.ids.get(b.flood_id)
+        if tag is not None:
+            self.alive[tag] -= 1
+
+    def copy_many(self, tags):          # Counts the copies of the packets in the numpy array tags queued
+        alive = np.frombuffer(self.alive, dtype=np.int32)
+        np.add.at(alive, tags, 1)
+
+    def receive_many(self, tags):       # Counts the copies of the packets in the numpy array tags received
+        alive = np.frombuffer(self.alive, dtype=np.int32)
+        np.subtract.at(alive, tags, 1)
+
+    def settle(self):                   # Counts the lost and the in flight packets of every flow
+        for flow in self.flows:
+            flow.lost = flow.in_flight = 0
+        for tag, f in enumerate(self.flow_of):
+            if not self.delivered[tag]:
+                if self.alive[tag] > 0:
+                    self.flows[f].in_flight += 1
+                else:
+                    self.flows[f].lost += 1
+
+    def per_flow(self, tags):           # Returns the number of packets of every flow in the numpy array tags
+        flow_of = np.frombuffer(self.flow_of, dtype=np.int32)
+        return np.bincount(flow_of[tags], minlength=len(self.flows)).tolist()
+
+    def run(self, net, mode='seen', ticks=100):     # Runs the flows over the network for ticks iterations
+        if isinstance(net, AggregateNetwork):
+            if mode != 'problem':
+                raise ValueError('AggregateNetwork only runs the problem mode')
+            run_tick = net.run_tick
+        else:
+            run_tick = Scheduler(net, mode).run_tick
+        net.workload = self
+        transmissions = net.transmissions
+        start = time.perf_counter()
+        for t in range(self.ticks, self.ticks + ticks):
+            self.inject(net, t, mode)
+            run_tick(t)
+        self.seconds += time.perf_counter() - start
+        self.ticks += ticks
+        self.transmissions += net.transmissions - transmissions
+
+    def report(self):                   # Returns a row of counters, latencies, throughput and loss for every flow
+        self.settle()
+        rows = []
+        for f, flow in enumerate(self.flows):
+            rows.append({'flow': f, 'source': flow.source, 'destination': flow.destination, 'process': flow.process,
+                         'rate': flow.rate, 'injected': flow.injected, 'delivered': flow.delivered,
+                         'loss': flow.get_loss(), 'in_flight': flow.in_flight, 'dropped': flow.dropped,
+                         'duplicates': flow.duplicates,
+                         'throughput': flow.delivered / self.ticks if self.ticks else 0.0,
+                         'latency_mean': flow.get_mean_latency(), 'latency_p50': flow.get_latency(0.5),
+                         'latency_p95': flow.get_latency(0.95), 'latency_p99': flow.get_latency(0.99),
+                         'latency_max': max(flow.latencies, default=None)})
+        return rows
+
+    def print_report(self):             # Prints the report of every flow and the speed of the run
+        print('Flow  Source  Dest  Process   Injected  Delivered    Loss  In flight  Dropped  Throughput   Mean    p50'
+              '    p95    p99')
+        for row in self.report():
+            latencies = ['{:>6}'.format('-') if row[key] is None else '{:>6.1f}'.format(row[key])
+                         for key in ('latency_mean', 'latency_p50', 'latency_p95', 'latency_p99')]
+            print('{:>4} {:>7} {:>5}  {:<8} {:>9} {:>10} {:>7.1%} {:>10} {:>8} {:>11.3f} '.format(
+                row['flow'], row['source'], row['destination'], row['process'], row['injected'], row['delivered'],
+                row['loss'], row['in_flight'], row['dropped'], row['throughput']) + ' '.join(latencies))
+        rate = self.transmissions / self.seconds if self.seconds else 0.0
+        print('{} packet hops in {} iterations, {:.3f} seconds, {:,.0f} packet hops per second'.format(
+            self.transmissions, self.ticks, self.seconds, rate))
+
+
+def parse_pair(text):                   # Parses a source:destination pair of the command line
+    source, destination = text.split(':')
+    return int(source), int(destination)
+
+
+def parse_branch(text):                 # Parses a MODE[:LINK,LINK...] branch of the command line
+    mode, _, links = text.partition(':')
+    if mode not in MODES:
+        raise ValueError('Unknown forwarding mode: ' + mode)
+    return mode, [int(c) for c in links.split(',')] if links else []
+
+
+def parse_ttl(text):                    # Parses a command line ttl, auto is the smallest ttl reaching the destination
+    return None if text == 'auto' else int(text)
+
+
+def demo():                             # Runs the problem and the solution flood on the built-in topology
+    Net = build_network(TOPOLOGY)       # Creates the network topology and makes all the connections of the network
+    Net.print_topology()
+    initial = Snapshot.take(Net)        # The empty network, the solution run starts again from it
+
+    pct_problem = Packet()                  # Makes a new packet to be transmitted
+    scheduler = Scheduler(Net, 'problem')   # Schedules the sends of the problem run
+    Net.init_network(0, pct_problem)     # Puts a packet in the Source node which at once decrements the ttl hence +1
+
+    output = TextSink()                 # Prints the queues after every iteration
+
+    print('\n**********   Network No  Solution    **********\n')
+    for run in range(12):                # Runs from 0 - 11 which is the discrete time
+        scheduler.run_tick(run)             # Sends every packet due in this iteration in the node priority order
+        output.record(Net, run)
+
+    print('\n\n**********       End  Of  Run        **********\n\n')
+
+    Net = initial.restore()     # Puts the network back in its state before the problem run
+    print('\n**********   Network Run  Solution   **********\n')
+    pct_solution = Packet()     # Creates a new packet object
+    pct_solution.ttl = Net.minimal_ttl(0, 14)   # Sets the packet objects ttl 4, the hop distance to the destination
+    scheduler = Scheduler(Net, 'solution')      # Schedules the sends of the solution run
+    Net.init_network(0, pct_solution)   # Puts the packet in the node 0 for initialization of the network
+
+    for run in range(12):       # Runs from 0 - 11 which is the discrete time
+        scheduler.run_tick(run)
+        output.record(Net, run)
+
+    print('\n\n**********       End  Of  Run        **********\n\n')
+
+    # Used to identify that packet have been received at all of networks nodes
+    for pr in range(1, len(Net.nodes)):
+        print("Node: " + str(Net.nodes[pr].get_node_id()) + " Received: " + str(Net.nodes[pr].packets_received) + " Packets")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Flooding network simulator')
+    commands = parser.add_subparsers(dest='command')
+    sweep_parser = commands.add_parser('sweep', help='run every combination of the given scenarios on a process pool')
+    sweep_parser.add_argument('--topology', nargs='+', default=['builtin'], help=load_topology.__doc__)
+    sweep_parser.add_argument('--pair', nargs='+', type=parse_pair, default=[(0, 14)], metavar='SOURCE:DESTINATION')
+    sweep_parser.add_argument('--ttl', nargs='+', type=parse_ttl, default=[11], help='a number of hops or auto')
+    sweep_parser.add_argument('--mode', nargs='+', default=['problem'], choices=MODES)
+    sweep_parser.add_argument('--ticks', type=int, default=12)
+    sweep_parser.add_argument('--workers', type=int, default=None)
+    sweep_parser.add_argument('--output', default='sweep.csv')
+    partition_parser = commands.add_parser('partition', help='run one flood split over worker processes and report '
+                                                             'the speedup')
+    partition_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    partition_parser.add_argument('--pair', type=parse_pair, default=(0, 14), metavar='SOURCE:DESTINATION')
+    partition_parser.add_argument('--ttl', type=int, default=11)
+    partition_parser.add_argument('--mode', default='problem', choices=['problem', 'solution'])
+    partition_parser.add_argument('--ticks', type=int, default=12)
+    partition_parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4, 8])
+    dedup_parser = commands.add_parser('dedup', help='compare the source list of the solution with the seen caches '
+                                                     'on concurrent floods')
+    dedup_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    dedup_parser.add_argument('--pair', nargs='+', type=parse_pair, metavar='SOURCE:DESTINATION',
+                              help='the floods, random pairs if not given')
+    dedup_parser.add_argument('--floods', type=int, default=8, help='number of random floods')
+    dedup_parser.add_argument('--seed', type=int, default=0)
+    dedup_parser.add_argument('--ttl', type=parse_ttl, default=None, help='a number of hops or auto')
+    dedup_parser.add_argument('--ticks', type=int, default=12)
+    dedup_parser.add_argument('--capacity', type=int, default=1024, help='flood ids a node remembers')
+    dedup_parser.add_argument('--max-age', type=int, default=None, help='iterations a node remembers a flood id')
+    workload_parser = commands.add_parser('workload', help='run concurrent flows with bounded queues and report the '
+                                                           'latency, throughput and loss of every flow')
+    workload_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    workload_parser.add_argument('--pair', nargs='+', type=parse_pair, metavar='SOURCE:DESTINATION',
+                                 help='the flows, random pairs if not given')
+    workload_parser.add_argument('--flows', type=int, default=4, help='number of random flows')
+    workload_parser.add_argument('--seed', type=int, default=0)
+    workload_parser.add_argument('--process', default='constant', choices=Flow.PROCESSES)
+    workload_parser.add_argument('--rate', type=float, default=0.2, help='packets per iteration of every flow')
+    workload_parser.add_argument('--burst', type=int, default=8, help='packets in a burst of the bursty process')
+    workload_parser.add_argument('--ttl', type=parse_ttl, default=None, help='a number of hops or auto')
+    workload_parser.add_argument('--mode', default=None, choices=MODES,
+                                 help='seen by default, problem with the aggregate engine')
+    workload_parser.add_argument('--ticks', type=int, default=100)
+    workload_parser.add_argument('--capacity', type=int, default=1, help='packets a link carries per iteration')
+    workload_parser.add_argument('--queue-limit', type=int, default=None, help='packets a node queue holds')
+    workload_parser.add_argument('--drop', default='tail', choices=DROP_POLICIES, help='packet a full queue drops')
+    workload_parser.add_argument('--engine', default='network', choices=['network', 'aggregate'],
+                                 help='aggregate runs the problem mode on arrays of all links at once')
+    emulate_parser = commands.add_parser('emulate', help='run one flood with the nodes as asyncio tasks and the links '
+                                                         'as channels with a delay and a bandwidth')
+    emulate_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    emulate_parser.add_argument('--pair', type=parse_pair, default=(0, 14), metavar='SOURCE:DESTINATION')
+    emulate_parser.add_argument('--ttl', type=parse_ttl, default=11, help='a number of hops or auto')
+    emulate_parser.add_argument('--mode', default='problem', choices=MODES)
+    emulate_parser.add_argument('--ticks', type=int, default=12)
+    emulate_parser.add_argument('--delay', type=int, default=1, help='iterations a link delays a packet')
+    emulate_parser.add_argument('--bandwidth', type=int, default=None, help='packets a link carries per iteration')
+    emulate_parser.add_argument('--udp', action='store_true', help='send the packets over a loopback UDP socket')
+    emulate_parser.add_argument('--check', action='store_true', help='compare every iteration with the Scheduler, '
+                                                                     'equal for a delay of 1')
+    whatif_parser = commands.add_parser('whatif', help='snapshot a flood after an iteration and run branches of it '
+                                                       'with other modes or failed links')
+    whatif_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    whatif_parser.add_argument('--pair', type=parse_pair, default=(0, 14), metavar='SOURCE:DESTINATION')
+    whatif_parser.add_argument('--ttl', type=parse_ttl, default=11, help='a number of hops or auto')
+    whatif_parser.add_argument('--mode', default='problem', choices=MODES, help='mode of the run up to the snapshot')
+    whatif_parser.add_argument('--at', type=int, default=3, help='iteration after which the snapshot is taken')
+    whatif_parser.add_argument('--ticks', type=int, default=12)
+    whatif_parser.add_argument('--branch', nargs='+', type=parse_branch, metavar='MODE[:LINK,LINK]',
+                               default=[(mode, []) for mode in MODES], help='mode and failed links of every branch')
+    whatif_parser.add_argument('--snapshot', default='snapshot.bin', help='file the snapshot is written to')
+    whatif_parser.add_argument('--workers', type=int, default=1, help='processes running the branches')
+    run_parser = commands.add_parser('run', help='run one flood and write its output to a sink')
+    run_parser.add_argument('--topology', default='builtin', help=load_topology.__doc__)
+    run_parser.add_argument('--pair', type=parse_pair, default=(0, 14), metavar='SOURCE:DESTINATION')
+    run_parser.add_argument('--ttl', type=parse_ttl, default=11, help='a number of hops or auto')
+    run_parser.add_argument('--mode', default='problem', choices=MODES)
+    run_parser.add_argument('--ticks', type=int, default=12)
+    run_parser.add_argument('--sink', default='text', choices=['text', 'trace', 'null'])
+    run_parser.add_argument('--trace', default='trace', help='directory of the trace written by the trace sink')
+    run_parser.add_argument('--interval', type=int, default=1, help='record every interval-th iteration')
+    run_parser.add_argument('--counters', help='CSV file the per iteration event counters are written to')
+    run_parser.add_argument('--link-counters', help='CSV file the per iteration and link event counters are written to')
+    args = parser.parse_args(argv)
+
+    if args.command == 'sweep':
+        scenarios = [Scenario(topology, source, destination, ttl, mode, args.ticks)
+                     for topology in args.topology for source, destination in args.pair
+                     for ttl in args.ttl for mode in args.mode]
+        count = sweep(scenarios, args.output, args.workers)
+        print('Wrote ' + str(count) + ' scenarios to ' + args.output)
+    elif args.command == 'run':
+        if args.sink == 'text':
+            sink = TextSink(args.pair[1], args.interval)
+        elif args.sink == 'trace':
+            sink = TraceWriter(args.trace, args.interval)
+        else:
+            sink = NullSink()
+        instruments = Instruments() if args.counters or args.link_counters else None
+        simulate(load_topology(args.topology), args.pair[0], args.pair[1], args.ttl, args.mode, args.ticks, sink,
+                 instruments)
+        sink.close()
+        if args.counters:
+            instruments.write_csv(args.counters, range(args.ticks))
+        if args.link_counters:
+            instruments.write_link_csv(args.link_counters)
+    elif args.command == 'dedup':
+        topology = load_topology(args.topology)
+        floods = args.pair or random_floods(topology, args.floods, args.seed)
+        dedup_report(topology, floods, args.ttl, args.ticks, args.capacity, args.max_age)
+    elif args.command == 'workload':
+        if args.mode is None:
+            args.mode = 'problem' if args.engine == 'aggregate' else 'seen'
+        if args.engine == 'aggregate' and args.mode != 'problem':
+            parser.error('the aggregate engine only runs the problem mode, not ' + args.mode)
+        if args.engine == 'aggregate' and args.drop != 'tail':
+            parser.error('the aggregate engine only supports the tail drop policy')
+        topology = load_topology(args.topology)
+        pairs = args.pair or random_floods(topology, args.flows, args.seed)
+        net = build_network(topology)
+        if args.engine == 'aggregate':
+            net = AggregateNetwork(net)
+        net.set_link_capacity(args.capacity)
+        net.set_queue_limit(args.queue_limit, args.drop)
+        workload = Workload([Flow(source, destination, args.rate, args.process, args.burst, args.ttl)
+                             for source, destination in pairs], args.seed)
+        workload.run(net, args.mode, args.ticks)
+        workload.print_report()
+    elif args.command == 'emulate':
+        emulation_report(load_topology(args.topology), args.pair[0], args.pair[1], args.ttl, args.mode, args.ticks,
+                         args.delay, args.bandwidth, args.udp, args.check)
+    elif args.command == 'whatif':
+        what_if_report(load_topology(args.topology), args.pair[0], args.pair[1], args.ttl, args.mode, args.at,
+                       args.ticks, args.branch, args.snapshot, args.workers)
+    elif args.command == 'partition':
+        speedup_report(load_topology(args.topology), args.pair[0], args.pair[1], args.ttl, args.mode, args.ticks,
+                       args.workers)
+    else:
+        demo()
+
+
+if __name__ == '__main__':
+    main()
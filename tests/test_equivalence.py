@@ -0,0 +1,73 @@
+""" Checks the engines which have to reproduce the discrete tick simulation, the partitioned run, the asyncio emulator,
+    the aggregate engine and a network restored from a snapshot, against simulate() iteration for iteration on the
+    built-in topology and on a random scale-free topology for every forwarding mode"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+TICKS = 14
+
+
+def floods(mode):                       # (topology, source, destination, ttl) of the floods compared in a mode
+    seed = flooding.MODES.index(mode) + 1
+    return [(flooding.load_topology('builtin'), 0, 14, 11),
+            (flooding.load_topology('scale-free:50:2:' + str(seed)), 0, 49, 6)]
+
+
+def network_states(net, scheduler, start, ticks):   # Runs the iterations start - ticks - 1 and returns their states
+    states = []
+    for run in range(start, ticks):
+        scheduler.run_tick(run)
+        states.append((net.queue_sizes(), net.received_counts()))
+    return states
+
+
+@pytest.mark.parametrize('mode', ['problem', 'solution'])
+def test_partitioned(mode):
+    for topology, source, destination, ttl in floods(mode):
+        expected = flooding.simulate(topology, source, destination, ttl, mode, TICKS)
+        assert flooding.run_partitioned(topology, source, destination, ttl, mode, TICKS, 2) == expected
+
+
+@pytest.mark.parametrize('mode', flooding.MODES)
+def test_emulate(mode):
+    for topology, source, destination, ttl in floods(mode):
+        expected = flooding.simulate(topology, source, destination, ttl, mode, TICKS)
+        assert flooding.emulate(topology, source, destination, ttl, mode, TICKS) == expected
+
+
+def test_aggregate():
+    pytest.importorskip('numpy')
+    for topology, source, destination, ttl in floods('problem'):
+        expected = flooding.simulate(topology, source, destination, ttl, 'problem', TICKS)
+        net = flooding.AggregateNetwork(flooding.build_network(topology))
+        packet = flooding.Packet()
+        packet.ttl = ttl
+        packet.set_destination(destination)
+        net.init_network(source, packet)
+        states = []
+        for run in range(TICKS):
+            net.run_tick(run)
+            states.append((net.queue_sizes().tolist(), net.packets_received.tolist()))
+        assert states == expected
+
+
+@pytest.mark.parametrize('mode', flooding.MODES)
+def test_snapshot_restore(mode, tmp_path):
+    for topology, source, destination, ttl in floods(mode):
+        expected = flooding.simulate(topology, source, destination, ttl, mode, TICKS)
+        net = flooding.build_network(topology)
+        scheduler = flooding.Scheduler(net, mode)
+        flooding.inject(net, source, destination, ttl, mode)
+        assert network_states(net, scheduler, 0, 5) == expected[:5]
+        path = str(tmp_path / 'flood.snapshot')
+        flooding.Snapshot.take(net).save(path)
+        snapshot = flooding.Snapshot.load(path)
+        for branch in range(2):         # Every restore continues the flood on its own
+            restored = snapshot.restore()
+            assert network_states(restored, flooding.Scheduler(restored, mode), 5, TICKS) == expected[5:]
+        snapshot.close()
@@ -0,0 +1,33 @@
+""" Checks the events counted by the instruments against the counters the network keeps itself, the transmissions,
+    the packets received at the destination and the packets left in the queues after every iteration"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+TICKS = 14
+
+
+@pytest.mark.parametrize('mode', flooding.MODES)
+@pytest.mark.parametrize('spec, destination, ttl', [('builtin', 14, 11), ('scale-free:50:2:3', 49, 6)])
+def test_counts(mode, spec, destination, ttl):
+    net = flooding.build_network(flooding.load_topology(spec))
+    instruments = net.instruments = flooding.Instruments()
+    scheduler, ttl = flooding.start_flood(net, 0, destination, ttl, mode)
+    queued = []                         # Packets in the network after every iteration
+    for run in range(TICKS):
+        scheduler.run_tick(run)
+        queued.append(sum(net.queue_sizes()))
+    by_tick = instruments.by_tick
+    assert sum(instruments.by_node['send'].values()) == net.transmissions
+    assert sum(instruments.by_link['send'].values()) == net.transmissions
+    for run in range(1, TICKS):         # Every packet due in an iteration is either sent or retried
+        assert by_tick['send'][run] + by_tick['retry'][run] == queued[run - 1]
+        assert by_tick['retry'][run] + by_tick['duplicate'][run] == queued[run]
+    if mode in ('problem', 'seen'):     # The other modes count every copy reaching a node as received
+        delivered = instruments.by_node['delivery']
+        assert delivered[destination] == net.nodes[destination].packets_received
+        assert sum(delivered.values()) == delivered[destination]
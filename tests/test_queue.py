@@ -0,0 +1,54 @@
+""" Checks that indexing a node queue follows the order the packets arrived in, although the queue keeps them bucketed
+    on their execution time and next hop, and that a snapshot keeps that order"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+
+def queued_node(hops, times=None):      # Node holding one packet per next hop in hops, due at times or all at once
+    node = flooding.Node()
+    packets = []
+    for i, hop in enumerate(hops):
+        packet = flooding.Packet()
+        packet.set_next(hop)
+        packet.set_exec_time(times[i] if times else 0)
+        packet.ttl = i
+        node.add_queue(packet)
+        packets.append(packet)
+    return node, packets
+
+
+def test_index_arrival_order():
+    node, packets = queued_node([3, 5, 3])
+    assert [node.get_queue(i) for i in range(3)] == packets
+    assert node.get_queue(-1) is packets[2]
+    node.remove_queue(1)
+    assert [node.get_queue(i) for i in range(2)] == [packets[0], packets[2]]
+    node.remove_queue(0)
+    assert node.get_queue(0) is packets[2]
+    assert node.queue_size() == 1
+
+
+def test_index_after_delay():         # The first packet is due after the second one but still arrived first
+    node, packets = queued_node([3, 5], [2, 0])
+    assert [node.get_queue(i) for i in range(2)] == packets
+
+
+def test_snapshot_arrival_order(tmp_path):
+    net = flooding.build_network(flooding.load_topology('builtin'))
+    node = net.nodes[0]
+    for i, hop in enumerate([3, 5, 3]):
+        packet = flooding.Packet()
+        packet.set_next(hop)
+        packet.ttl = i
+        node.add_queue(packet)
+    path = str(tmp_path / 'queue.snapshot')
+    flooding.Snapshot.take(net).save(path)
+    snapshot = flooding.Snapshot.load(path)
+    restored = snapshot.restore().nodes[0]
+    assert [restored.get_queue(i).ttl for i in range(3)] == [0, 1, 2]
+    restored.remove_queue(1)
+    assert [restored.get_queue(i).ttl for i in range(2)] == [0, 2]
+    snapshot.close()
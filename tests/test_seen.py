@@ -0,0 +1,46 @@
+""" Checks the eviction of the seen cache on its capacity and on the age of its ids, and the copies suppressed by the
+    seen mode on the built-in topology"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+
+def test_check_capacity():
+    seen = flooding.SeenCache(capacity=2)
+    assert not seen.check('a', 0)
+    assert not seen.check('b', 1)
+    assert seen.check('a', 2)           # a becomes the most recently seen id, b is evicted next
+    assert not seen.check('c', 3)
+    assert list(seen.entries) == ['a', 'c']
+    assert not seen.check('b', 4)
+    assert seen.check('c', 5)
+    assert len(seen) == 2
+
+
+def test_check_max_age():
+    seen = flooding.SeenCache(max_age=2)
+    assert not seen.check('a', 0)
+    assert not seen.check('b', 1)
+    assert seen.check('a', 2)           # Seen again within max_age, its age starts over
+    assert seen.check('b', 3)
+    assert seen.check('a', 4)
+    assert not seen.check('b', 7)       # Last seen at 3, older than max_age at 7
+    assert list(seen.entries) == ['b']
+
+
+def test_suppressed_builtin():
+    topology = flooding.load_topology('builtin')
+    instruments = flooding.Instruments()
+    net = flooding.flood(topology, [(0, 14)], 30, 'seen', 40, instruments=instruments)
+    suppressed = instruments.by_node['suppressed']
+    delivered = sum(instruments.by_node['delivery'].values())
+    degree = [topology.offsets[a + 1] - topology.offsets[a] for a in range(topology.node_count)]
+    # Every node but the destination forwards the flood once, to all its neighbors but the one it came from
+    assert net.transmissions == sum(degree) - degree[14] - (topology.node_count - 2)
+    assert delivered == degree[14]
+    # Every other copy reaching a node which already forwarded the flood is suppressed
+    assert sum(suppressed.values()) == net.transmissions - delivered - (topology.node_count - 2) == 24
+    assert 14 not in suppressed
+    assert all(len(node.seen) == 1 for a, node in net.nodes.get_created() if a != 14)
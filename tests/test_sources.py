@@ -0,0 +1,35 @@
+""" Checks the membership tests of the source list on the identifiers held in the bitmask and in the linked entries,
+    for python and numpy integers and for values which are never node identifiers"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+
+def source_list(nodes):                 # Source list holding the identifiers in nodes
+    sources = flooding.SourceList()
+    for a in nodes:
+        sources = sources.add(a)
+    return sources
+
+
+def test_contains():
+    sources = source_list([3, 70, 5, 200])
+    for a in (3, 5, 70, 200):
+        assert a in sources
+    for a in (0, 4, 64, 199, -3):
+        assert a not in sources
+    for a in (3.0, '3', None):
+        assert a not in sources
+
+
+def test_contains_numpy():
+    np = pytest.importorskip('numpy')
+    sources = source_list([3, 70])
+    assert np.int64(3) in sources
+    assert np.int32(70) in sources
+    assert np.int64(4) not in sources
+    assert np.float64(3) not in sources
@@ -0,0 +1,45 @@
+""" Checks that a sweep survives a scenario killing its worker process, the scenarios in flight run again on a fresh
+    pool of the full size and only a scenario breaking a pool twice runs alone"""
+import csv
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+run_scenario = flooding.run_scenario
+
+
+def crashing_scenario(scenario):        # Kills the worker process on the scenario with the destination 13
+    if scenario.destination == 13:
+        os._exit(1)
+    return run_scenario(scenario)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork', reason='the workers have to inherit the patch')
+def test_sweep_survives_a_crashing_scenario(tmp_path, monkeypatch):
+    pools = []
+    class CountingPool(ProcessPoolExecutor):
+        def __init__(self, max_workers=None, *args, **kwargs):
+            pools.append(max_workers)
+            super().__init__(max_workers, *args, **kwargs)
+
+    monkeypatch.setattr(flooding, 'run_scenario', crashing_scenario)
+    monkeypatch.setattr('concurrent.futures.ProcessPoolExecutor', CountingPool)
+    scenarios = [flooding.Scenario('builtin', 0, destination, None, mode)
+                 for destination in range(1, 15) for mode in ('problem', 'solution')]
+    output = str(tmp_path / 'sweep.csv')
+    assert flooding.sweep(scenarios, output, workers=3) == len(scenarios)
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(scenarios)
+    crashed = [row for row in rows if row['status'] != 'ok']
+    assert sorted((row['destination'], row['mode']) for row in crashed) == [('13', 'problem'), ('13', 'solution')]
+    assert all(row['status'].startswith('error: worker process died') for row in crashed)
+    assert all(workers in (1, 3) for workers in pools)      # Broken pools are replaced by pools of the full size
+    assert len(crashed) <= pools.count(1) <= 2 * len(crashed)   # Only the scenarios breaking two pools ran alone
+    assert len(pools) - pools.count(1) <= 2 * len(crashed) + 1
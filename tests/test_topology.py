@@ -0,0 +1,58 @@
+""" Checks the topologies loaded from edge list and adjacency list files against the same links given in memory, and
+    that the random generators give the same topology for the same seed"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+EDGES = [(0, 1), (0, 2), (1, 2), (2, 3), (3, 4), (1, 4)]
+
+
+def layout(topology):                   # The arrays describing a topology, as lists
+    return (topology.node_count, list(topology.link_source), list(topology.link_target), list(topology.offsets),
+            list(topology.adjacent), list(topology.adjacent_link))
+
+
+def test_load_edgelist(tmp_path):
+    path = tmp_path / 'links.txt'
+    path.write_text('# source target weight\n' + ''.join('{} {} {}.5\n'.format(a, b, a + b) for a, b in EDGES[:3]) +
+                    '\n% a comment in the middle\n' + ''.join('{}\t{}\t1\n'.format(a, b) for a, b in EDGES[3:]))
+    topology = flooding.Topology.load(str(path))
+    assert layout(topology) == layout(flooding.Topology.from_edges(EDGES))
+    assert topology.neighbors(2) == [(0, 1), (1, 2), (3, 3)]
+    assert topology.find_link(4, 1) == 5
+    assert flooding.Topology.load(str(path), node_count=7).node_count == 7
+
+
+def test_load_adjlist(tmp_path):
+    path = tmp_path / 'links.adj'
+    path.write_text('# node neighbors\n0 1 2\n1 2\n% a node can take several lines\n2 3\n3 4\n1 4\n\n4\n')
+    topology = flooding.Topology.load(str(path), 'adjlist')
+    assert layout(topology) == layout(flooding.Topology.from_edges(EDGES))
+    assert layout(flooding.load_topology('adjlist:' + str(path))) == layout(topology)
+
+
+def test_load_unknown_format(tmp_path):
+    path = tmp_path / 'links.txt'
+    path.write_text('0 1\n')
+    with pytest.raises(ValueError):
+        flooding.Topology.load(str(path), 'graphml')
+
+
+@pytest.mark.parametrize('generate, args', [(flooding.geometric_topology, (200, 0.1)),
+                                            (flooding.erdos_renyi_topology, (200, 0.03)),
+                                            (flooding.scale_free_topology, (200, 2))])
+def test_generator_seed(generate, args):
+    topology = generate(*args, seed=7)
+    assert topology.get_link_count() > 0
+    assert layout(generate(*args, seed=7)) == layout(topology)
+    assert layout(generate(*args, seed=8)) != layout(topology)
+
+
+def test_grid():
+    topology = flooding.grid_topology(3, 4)
+    assert topology.get_link_count() == 3 * 3 + 2 * 4
+    assert sorted(b for b, link in topology.neighbors(5)) == [1, 4, 6, 9]
@@ -0,0 +1,31 @@
+""" Checks a trace written by the TraceWriter sink and loaded back by read_trace against the states of the same run"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+TICKS = 14
+
+
+def test_trace_interval(tmp_path):
+    pytest.importorskip('numpy')
+    topology = flooding.load_topology('builtin')
+    path = str(tmp_path / 'trace')
+    writer = flooding.TraceWriter(path, interval=2, buffer_size=256)    # Small enough to flush in the middle of the run
+    states = flooding.simulate(topology, 0, 14, 11, 'problem', TICKS, writer)
+    writer.close()
+    trace = flooding.read_trace(path)
+    samples = TICKS // 2
+    assert trace['ticks'].tolist() == list(range(0, TICKS, 2))
+    assert trace['queue_sizes'].shape == (samples, topology.node_count)
+    assert trace['packets_received'].shape == (samples, topology.node_count)
+    assert trace['queue_sizes'].tolist() == [sizes for sizes, received in states[::2]]
+    assert trace['packets_received'].tolist() == [received for sizes, received in states[::2]]
+    assert trace['busy_counts'].shape == (samples,)
+    assert trace['busy_offsets'].shape == (samples + 1,)
+    assert trace['busy_offsets'][-1] == len(trace['busy_links'])
+    assert trace['link_utilization'].shape == (topology.get_link_count(),)
+    assert trace['meta']['interval'] == 2
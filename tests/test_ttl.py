@@ -0,0 +1,38 @@
+""" Checks the hop distances cached by the network against link changes, the smallest ttl reaching a destination and
+    the pruned flood run with that ttl"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+
+def test_distances_after_link_changes():
+    net = flooding.build_network(flooding.load_topology('builtin'))
+    assert net.distances_to(14)[0] == 4
+    assert net.distances_to(0)[1] == 1
+    net.make_connection(0, 0, 14)       # Rewires the link 0 - 1 straight to the destination
+    assert net.distances_to(14)[0] == 1
+    assert net.distances_to(0)[1] == 2
+    net.remove_connection(0)
+    assert net.distances_to(14)[0] == 4
+    assert net.distances_to(0)[14] == 4
+    net.make_connection(0, 0, 1)
+    assert net.distances_to(0)[1] == 1
+
+
+def test_minimal_ttl_builtin():
+    net = flooding.build_network(flooding.load_topology('builtin'))
+    assert net.minimal_ttl(0, 14) == 4
+    assert net.minimal_ttl(14, 0) == 4
+
+
+def test_pruned_auto_ttl():
+    topology = flooding.load_topology('builtin')
+    result = flooding.run(topology, 0, 14, None, 'pruned', 12)
+    assert result.ttl == 4
+    assert result.delivery_tick is not None
+    assert result.in_network[-1] == 0
+    short = flooding.run(topology, 0, 14, 3, 'pruned', 12)      # One hop short, the source has nowhere to forward to
+    assert short.delivery_tick is None
+    assert short.transmissions == 0
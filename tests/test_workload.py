@@ -0,0 +1,55 @@
+""" Checks the loss accounting of the workload, a packet is only lost once none of its copies is left in the network"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import flooding_network as flooding     # noqa: E402
+
+
+def run_flow(ticks, stop=None):         # Runs one flow over a 10x10 grid in the seen mode and returns its report row
+    net = flooding.build_network('grid:10x10')
+    workload = flooding.Workload([flooding.Flow(0, 99, 1.0, 'constant', ttl=30, stop=stop)])
+    workload.run(net, 'seen', ticks)
+    return net, workload, workload.report()[0]
+
+
+def test_queued_copies_are_in_flight():
+    net, workload, row = run_flow(20)
+    assert row['injected'] == 20
+    assert row['dropped'] == 0
+    assert row['loss'] == 0.0
+    assert row['delivered'] + row['in_flight'] == 20
+    assert row['in_flight'] > 0
+    assert sum(workload.alive) == sum(net.queue_sizes())
+
+
+def test_drained_flow_has_nothing_in_flight():
+    net, workload, row = run_flow(60, stop=20)
+    assert row['delivered'] == 20
+    assert row['in_flight'] == 0
+    assert row['loss'] == 0.0
+    assert sum(net.queue_sizes()) == 0
+
+
+@pytest.mark.parametrize('engine', ['network', 'aggregate'])
+def test_copies_left_match_queues(engine):
+    if engine == 'aggregate':
+        pytest.importorskip('numpy')
+    topology = flooding.load_topology('builtin')
+    net = flooding.build_network(topology)
+    if engine == 'aggregate':
+        net = flooding.AggregateNetwork(net)
+    net.set_queue_limit(5)
+    workload = flooding.Workload([flooding.Flow(source, destination, 0.5, 'poisson', ttl=6, stop=15)
+                                  for source, destination in [(0, 14), (3, 12), (13, 1)]], seed=2)
+    for _ in range(8):
+        workload.run(net, 'problem', 5)
+        assert sum(workload.alive) == int(sum(net.queue_sizes()))
+    workload.report()
+    for flow in workload.flows:
+        assert flow.dropped > 0
+        assert flow.in_flight == 0
+        assert flow.lost + flow.delivered == flow.injected
+        assert flow.get_loss() == flow.lost / flow.injected